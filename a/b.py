@@ -20,6 +20,7 @@ import numpy as np
 import socket
 import threading
 import json
+import csv
 from psychopy import visual, core, event, monitors, gui
 from EyeLinkCoreGraphicsPsychoPy import EyeLinkCoreGraphicsPsychoPy
 from PIL import Image
@@ -195,10 +196,22 @@ def send_gaze_data(gaze_x, gaze_y, valid=True):
         if network_stats['errors'] % 100 == 0:  # Log every 100th error
             print(f"Send error: {e}")
 
+def pin_current_thread(core_id):
+    """Pin the calling thread to one CPU core (Linux only, best effort)"""
+    # For best results also keep the core free of other work with
+    # `taskset` / the `isolcpus` kernel option on the experiment machine
+    try:
+        os.sched_setaffinity(0, {core_id})
+    except (AttributeError, OSError):
+        pass
+
 def receive_gaze_data():
     """Continuously receive gaze data from Computer A"""
     global remote_gaze_data, network_stats
     
+    # Cores 0-1 usually take the interrupt handlers
+    pin_current_thread(2)
+    
     while True:
         try:
             data, addr = receive_socket.recvfrom(1024)
@@ -343,6 +356,17 @@ status_text = visual.TextStim(win, text='', pos=[0, scn_height//2 - 40], color='
 
 
 
+def drain_samples(trk, limit=32):
+    """Drain queued link data and return the most recent sample (or None)"""
+    out = None
+    for _ in range(limit):
+        d = trk.getNextData()
+        if d == 0:
+            break
+        if d == pylink.SAMPLE_TYPE:
+            out = trk.getFloatData()
+    return out
+
 def update_local_gaze_display():
     """Update local gaze marker based on own eye tracking data"""
     global local_gaze_stats
@@ -351,7 +375,9 @@ def update_local_gaze_display():
     
     sample = None
     try:
-        sample = el_tracker.getNewestSample()
+        # Read everything queued since the last frame in one pass instead of
+        # a getNewestSample() round-trip per call
+        sample = drain_samples(el_tracker)
     except Exception as e:
         pass
     
@@ -717,6 +743,9 @@ class OptimizedDyadUDPClient:
             
     def _receive_messages(self):
         """Receive UDP messages from server with minimal processing delay"""
+        # Keep off the gaze receive thread's core and the main (visual) thread
+        pin_current_thread(3)
+        
         while self.running:
             try:
                 data, addr = self.socket.recvfrom(1024)
@@ -869,6 +898,11 @@ def run_experiment():
     
     # Main experiment loop
     data_log = []
+    filename = f'dyad_client_{exp_info["participant_B_id"]}_{time.strftime("%Y%m%d_%H%M%S")}.csv'
+    trial_csv_file = open(filename, 'w', newline='')
+    trial_csv = csv.DictWriter(trial_csv_file, fieldnames=['trial', 'trial_score', 'total_score',
+                                                           'first_responder', 'first_response'])
+    trial_csv.writeheader()
     total_score = 0
     running = True
     
@@ -1003,17 +1037,16 @@ def run_experiment():
                 'first_responder': first_responder,
                 'first_response': first_response
             }
+            trial_csv.writerow(trial_log)
+            trial_csv_file.flush()
             data_log.append(trial_log)
         
         # ========== END EXPERIMENT ==========
         elif message['type'] == 'end_experiment':
             running = False
     
-    # Save data
-    import pandas as pd
-    df = pd.DataFrame(data_log)
-    filename = f'dyad_client_{exp_info["participant_B_id"]}_{time.strftime("%Y%m%d_%H%M%S")}.csv'
-    df.to_csv(filename, index=False)
+    # Rows were written as each trial finished
+    trial_csv_file.close()
     
     # Final results
     if data_log:
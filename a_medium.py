@@ -15,11 +15,21 @@ import numpy as np
 import socket
 import threading
 import json
+import struct
+import collections
+import ctypes
+import asyncio
 from psychopy import visual, core, event, monitors, gui
+from pyglet.window import key as pyglet_key
 from EyeLinkCoreGraphicsPsychoPy import EyeLinkCoreGraphicsPsychoPy
 from PIL import Image
 from string import ascii_letters, digits
 
+try:
+    import orjson  # optional, faster encode/decode of game sync messages
+except ImportError:
+    orjson = None
+
 # Network Configuration
 LOCAL_IP = "100.1.1.10"  # Computer A's IP
 REMOTE_IP = "100.1.1.11"  # Computer B's IP
@@ -27,10 +37,24 @@ GAZE_PORT = 8888
 SEND_PORT = 8889
 GAME_PORT = 8890  # New port for game synchronization
 
+# Gaze packet wire format: x, y, valid, sender ('A'/'B' as a byte)
+_PACKER = struct.Struct('<ddBB')
+
+# Outbound gaze packets are queued and flushed in batches by _flush_tx
+TX_BATCH_MAX = 16          # flush as soon as this many packets are queued
+TX_FLUSH_DEADLINE = 0.002  # or once the oldest queued packet is 2ms old
+_tx_queue = collections.deque()
+_tx_ready = threading.Condition()
+
 # Global variables
 el_tracker = None
 win = None
-remote_gaze_data = {'x': 0, 'y': 0, 'valid': False, 'timestamp': 0}
+# Latest gaze from Computer B in a 3-slot buffer of (x, y, valid, rx). The network
+# thread fills the slot after the published one, then publishes it by updating
+# remote_gaze_idx, so the render thread never sees a half-written sample.
+REMOTE_X, REMOTE_Y, REMOTE_VALID, REMOTE_RX = range(4)
+remote_gaze_buf = np.zeros((3, 4), dtype=np.float64)
+remote_gaze_idx = [0]
 network_stats = {'sent': 0, 'received': 0, 'errors': 0}
 
 # Game variables
@@ -39,14 +63,21 @@ current_round = 0
 total_rounds = 10
 grid_layout = []  # Will store the 8x8 grid layout
 grid_positions = []
+grid_draw_list = []  # bound draw methods for the revealed grid, in draw order
 trial_results = []
 game_sync_data = {'round': 0, 'target_pos': 0, 'grid_seed': 0, 'responses': {}}
 player_scores = {'A': 0, 'B': 0}
+b_response_event = threading.Event()  # set when Computer B's response for this round arrives
 
 # Game sockets
 game_send_socket = None
 game_receive_socket = None
 
+# Grid geometry (pixels) - 8x8 physical grid
+GRID_SIZE = 8
+GRID_CELL_SIZE = 70
+GRID_SPACING = 80
+
 # Image and condition variables
 images = {
     'face': [],
@@ -54,6 +85,13 @@ images = {
     'house': [],
     'car': []
 }
+# Decoded stimuli per category, (n, GRID_CELL_SIZE, GRID_CELL_SIZE, 3) in PsychoPy's -1..1 range
+image_arrays = {
+    'face': None,
+    'limb': None,
+    'house': None,
+    'car': None
+}
 conditions = {}
 
 # Category mapping (consistent with second code)
@@ -153,7 +191,7 @@ def load_conditions():
 
 def load_all_images():
     """Load all images from stimuli folder"""
-    global images
+    global images, image_arrays
     
     stimuli_path = 'stimuli'
     
@@ -183,8 +221,16 @@ def load_all_images():
             # Add placeholder entries
             for i in range(10):
                 images[category_key].append(f"placeholder_{category_key}_{i}")
+        else:
+            # Decode every image once, already at cell size, so rounds never touch disk.
+            # Rows are flipped because PsychoPy draws array row 0 at the bottom.
+            image_arrays[category_key] = np.stack([
+                np.flipud(np.asarray(Image.open(path).convert('RGB').resize((GRID_CELL_SIZE, GRID_CELL_SIZE)),
+                                     dtype=np.float32)) / 127.5 - 1.0
+                for path in images[category_key]
+            ])
     
-    print("✓ Image paths loaded")
+    print("✓ Images loaded")
 
 # Load conditions and images at startup
 load_conditions()
@@ -199,12 +245,13 @@ def setup_network():
         # Gaze data sockets
         send_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         send_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # Connected UDP: the kernel resolves the route once instead of per packet
+        send_socket.connect((REMOTE_IP, SEND_PORT))
         print(f"✓ Gaze send socket created for {REMOTE_IP}:{SEND_PORT}")
         
         receive_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         receive_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         receive_socket.bind((LOCAL_IP, GAZE_PORT))
-        receive_socket.settimeout(0.001)
         print(f"✓ Gaze receive socket bound to {LOCAL_IP}:{GAZE_PORT}")
         
         # Game synchronization sockets
@@ -215,9 +262,17 @@ def setup_network():
         game_receive_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         game_receive_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         game_receive_socket.bind((LOCAL_IP, GAME_PORT + 1))
-        game_receive_socket.settimeout(0.001)
         print(f"✓ Game receive socket bound to {LOCAL_IP}:{GAME_PORT + 1}")
         
+        # Larger kernel buffers so bursts are not dropped
+        for s in (send_socket, receive_socket, game_send_socket, game_receive_socket):
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 262144)
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 262144)
+        
+        # Receive sockets are non-blocking; the asyncio network loop reads them
+        receive_socket.setblocking(False)
+        game_receive_socket.setblocking(False)
+        
         return True
     except Exception as e:
         print(f"✗ Network setup failed: {e}")
@@ -228,21 +283,86 @@ def send_gaze_data(gaze_x, gaze_y, valid=True):
     global network_stats
     
     try:
-        data = {
-            'x': float(gaze_x),
-            'y': float(gaze_y),
-            'valid': valid,
-            'timestamp': time.time(),
-            'computer': 'A'
-        }
-        
-        message = json.dumps(data).encode('utf-8')
-        send_socket.sendto(message, (REMOTE_IP, SEND_PORT))
-        network_stats['sent'] += 1
+        message = _PACKER.pack(float(gaze_x), float(gaze_y), int(valid), ord('A'))
+        with _tx_ready:
+            _tx_queue.append(message)
+            # Wake the flusher for the first packet (starts the deadline) or a full batch
+            if len(_tx_queue) == 1 or len(_tx_queue) >= TX_BATCH_MAX:
+                _tx_ready.notify()
         
     except Exception as e:
         network_stats['errors'] += 1
 
+# sendmmsg(2) structures, so a whole batch goes out in one syscall on Linux
+class _iovec(ctypes.Structure):
+    _fields_ = [('iov_base', ctypes.c_void_p), ('iov_len', ctypes.c_size_t)]
+
+class _msghdr(ctypes.Structure):
+    _fields_ = [('msg_name', ctypes.c_void_p), ('msg_namelen', ctypes.c_uint32),
+                ('msg_iov', ctypes.POINTER(_iovec)), ('msg_iovlen', ctypes.c_size_t),
+                ('msg_control', ctypes.c_void_p), ('msg_controllen', ctypes.c_size_t),
+                ('msg_flags', ctypes.c_int)]
+
+class _mmsghdr(ctypes.Structure):
+    _fields_ = [('msg_hdr', _msghdr), ('msg_len', ctypes.c_uint)]
+
+_sendmmsg = None
+if platform.system() == 'Linux':
+    try:
+        _sendmmsg = ctypes.CDLL(None, use_errno=True).sendmmsg
+        _sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_mmsghdr), ctypes.c_uint, ctypes.c_int]
+        _sendmmsg.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _sendmmsg = None
+
+def _send_batch(batch):
+    """Send a list of packed gaze packets, with one sendmmsg call where available"""
+    if _sendmmsg is None:
+        for message in batch:
+            send_socket.send(message)
+        return len(batch)
+    
+    # send_socket is connected, so no per-message destination is needed
+    buffers = [ctypes.create_string_buffer(message, len(message)) for message in batch]
+    iovecs = (_iovec * len(batch))()
+    msgs = (_mmsghdr * len(batch))()
+    for i, buf in enumerate(buffers):
+        iovecs[i].iov_base = ctypes.addressof(buf)
+        iovecs[i].iov_len = len(batch[i])
+        msgs[i].msg_hdr.msg_iov = ctypes.pointer(iovecs[i])
+        msgs[i].msg_hdr.msg_iovlen = 1
+    
+    sent = _sendmmsg(send_socket.fileno(), msgs, len(batch), 0)
+    if sent < 0:
+        raise OSError(ctypes.get_errno(), 'sendmmsg failed')
+    return sent
+
+def _flush_tx():
+    """Single writer for the gaze socket: block for the first packet, then batch"""
+    global network_stats
+    
+    while True:
+        with _tx_ready:
+            while not _tx_queue:
+                _tx_ready.wait()
+            
+            # Give the batch up to TX_FLUSH_DEADLINE to fill before sending
+            deadline = time.monotonic() + TX_FLUSH_DEADLINE
+            while len(_tx_queue) < TX_BATCH_MAX:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                _tx_ready.wait(remaining)
+            
+            batch = [_tx_queue.popleft() for _ in range(min(len(_tx_queue), TX_BATCH_MAX))]
+        
+        try:
+            sent = _send_batch(batch)
+            network_stats['sent'] += sent
+            network_stats['errors'] += len(batch) - sent
+        except Exception as e:
+            network_stats['errors'] += len(batch)
+
 def send_game_data(data_type, data):
     """Send game synchronization data to Computer B"""
     try:
@@ -253,62 +373,78 @@ def send_game_data(data_type, data):
             'from': 'A'
         }
         
-        encoded = json.dumps(message).encode('utf-8')
+        encoded = orjson.dumps(message) if orjson else json.dumps(message).encode('utf-8')
         game_send_socket.sendto(encoded, (REMOTE_IP, GAME_PORT))
         
     except Exception as e:
         print(f"Game send error: {e}")
 
-def receive_gaze_data():
-    """Continuously receive gaze data from Computer B"""
-    global remote_gaze_data, network_stats
+def handle_gaze_packet(data):
+    """Apply one gaze packet from Computer B"""
+    global network_stats
     
-    while True:
-        try:
-            data, addr = receive_socket.recvfrom(1024)
-            gaze_info = json.loads(data.decode('utf-8'))
+    try:
+        x, y, valid, computer = _PACKER.unpack_from(data)
+        
+        if computer == ord('B'):
+            slot = (remote_gaze_idx[0] + 1) % 3
+            # rx is the local receive time, immune to clock skew between computers
+            remote_gaze_buf[slot] = (x, y, valid, time.monotonic())
+            remote_gaze_idx[0] = slot
+            network_stats['received'] += 1
             
-            if gaze_info.get('computer') == 'B':
-                remote_gaze_data.update(gaze_info)
-                network_stats['received'] += 1
-                
-        except socket.timeout:
-            continue
-        except Exception as e:
-            network_stats['errors'] += 1
-            time.sleep(0.001)
+    except Exception as e:
+        network_stats['errors'] += 1
 
-def receive_game_data():
-    """Continuously receive game synchronization data"""
+def handle_game_message(data):
+    """Apply one game synchronization message from Computer B"""
     global game_sync_data
     
-    while True:
-        try:
-            data, addr = game_receive_socket.recvfrom(1024)
-            message = json.loads(data.decode('utf-8'))
-            
-            if message.get('from') == 'B':
-                if message['type'] == 'response':
-                    game_sync_data['responses']['B'] = message['data']
-                elif message['type'] == 'ready':
-                    game_sync_data['b_ready'] = True
-                    
-        except socket.timeout:
-            continue
-        except Exception as e:
-            time.sleep(0.001)
+    try:
+        message = orjson.loads(data) if orjson else json.loads(data.decode('utf-8'))
+        
+        if message.get('from') == 'B':
+            if message['type'] == 'response':
+                game_sync_data['responses']['B'] = message['data']
+                b_response_event.set()
+            elif message['type'] == 'ready':
+                game_sync_data['b_ready'] = True
+                
+    except Exception as e:
+        pass
+
+class GazeProtocol(asyncio.DatagramProtocol):
+    """Receives gaze packets from Computer B on the network event loop"""
+    
+    def datagram_received(self, data, addr):
+        handle_gaze_packet(data)
+
+class GameProtocol(asyncio.DatagramProtocol):
+    """Receives game synchronization messages from Computer B on the network event loop"""
+    
+    def datagram_received(self, data, addr):
+        handle_game_message(data)
+
+def start_network_loop():
+    """Serve both receive sockets from one asyncio event loop in a daemon thread"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    
+    for sock, protocol in ((receive_socket, GazeProtocol), (game_receive_socket, GameProtocol)):
+        asyncio.run_coroutine_threadsafe(
+            loop.create_datagram_endpoint(protocol, sock=sock), loop).result()
+    return loop
 
 # Start network setup
 if not setup_network():
     print("Failed to setup network. Exiting...")
     sys.exit()
 
-# Start receiving threads
-receive_thread = threading.Thread(target=receive_gaze_data, daemon=True)
-receive_thread.start()
+# Start receiving (gaze and game sockets share one event loop thread)
+network_loop = start_network_loop()
 
-game_receive_thread = threading.Thread(target=receive_game_data, daemon=True)
-game_receive_thread.start()
+flush_thread = threading.Thread(target=_flush_tx, daemon=True)
+flush_thread.start()
 
 print("✓ Network communication started")
 
@@ -376,7 +512,12 @@ print("✓ Tracker configured for competitive game recording")
 print("\n3. SETTING UP DISPLAY")
 print("-" * 25)
 mon = monitors.Monitor('myMonitor', width=53.0, distance=70.0)
-win = visual.Window(fullscr=full_screen, monitor=mon, winType='pyglet', units='pix', color=[0, 0, 0])
+win = visual.Window(fullscr=full_screen, monitor=mon, winType='pyglet', units='pix', color=[0, 0, 0],
+                    waitBlanking=True)
+
+# Keyboard state kept up to date by pyglet as flip() dispatches window events
+key_state = pyglet_key.KeyStateHandler()
+win.winHandle.push_handlers(key_state)
 
 scn_width, scn_height = win.size
 print(f"✓ Window: {scn_width} x {scn_height}")
@@ -385,6 +526,14 @@ if 'Darwin' in platform.system() and use_retina:
     scn_width = int(scn_width/2.0)
     scn_height = int(scn_height/2.0)
 
+# Gaze (tracker pixels) -> window coordinates, folded into scale + offset
+_AX = 1.2
+_BX = -scn_width/2 + 400 - 60
+_AY = -1.2
+_BY = scn_height/2 + 200 - 25
+_XLIM = scn_width/2
+_YLIM = scn_height/2
+
 # Configure EyeLink graphics
 el_coords = "screen_pixel_coords = 0 0 %d %d" % (scn_width - 1, scn_height - 1)
 el_tracker.sendCommand(el_coords)
@@ -415,121 +564,98 @@ print("-" * 30)
 local_gaze_marker = visual.Circle(win=win, radius=8, fillColor='blue', lineColor='white', lineWidth=1)
 remote_gaze_marker = visual.Circle(win=win, radius=8, fillColor='red', lineColor='white', lineWidth=1)
 
-# Game grid elements
-def create_grid_from_condition(condition, difficulty):
+# Recall phase instructions (built once, drawn every frame)
+instruction_text = visual.TextStim(win, text='H=House  C=Car  F=Face  L=Limb',
+                                 pos=[0, -scn_height//2 + 30], color='white', height=16)
+
+# Game grid elements - 8x8 physical grid centred on screen
+# Cell centres in row-major order, computed once
+_grid_cols, _grid_rows = np.meshgrid(np.arange(GRID_SIZE), np.arange(GRID_SIZE))
+_GRID_START_X = -(GRID_SIZE - 1) * GRID_SPACING / 2
+_GRID_START_Y = (GRID_SIZE - 1) * GRID_SPACING / 2
+_POS = np.stack([(_GRID_START_X + _grid_cols * GRID_SPACING).ravel(),
+                 (_GRID_START_Y - _grid_rows * GRID_SPACING).ravel()], axis=1)
+
+# One generator for grid randomness; each round's grid is drawn from a seed taken from it
+rng = np.random.default_rng()
+
+_CATEGORY_NAMES = np.array([CATEGORY_MAP[i] for i in range(len(CATEGORY_MAP))])
+_CATEGORY_COLORS = {
+    'face': 'orange',
+    'limb': 'green', 
+    'house': 'purple',
+    'car': 'yellow'
+}
+
+# Stimulus pools, one slot per cell, reused every round instead of rebuilt.
+# Cells never move, so positions are set here once.
+_IMAGE_POOL = [visual.ImageStim(win, image=None, pos=pos, size=(GRID_CELL_SIZE, GRID_CELL_SIZE))
+               for pos in _POS.tolist()]
+_RECT_POOL = [visual.Rect(win=win, width=GRID_CELL_SIZE, height=GRID_CELL_SIZE,
+                          lineColor='white', lineWidth=2, pos=pos)
+              for pos in _POS.tolist()]
+_LABEL_POOL = [visual.TextStim(win, text='', pos=pos, color='black', height=24, bold=True)
+               for pos in _POS.tolist()]
+_COVER_POOL = [visual.Rect(win=win, width=GRID_CELL_SIZE, height=GRID_CELL_SIZE,
+                           fillColor='gray', lineColor='white', lineWidth=2, pos=pos)
+               for pos in _POS.tolist()]
+_pool_image_paths = [None] * len(_IMAGE_POOL)  # image currently loaded in each slot
+
+def create_grid_from_condition(condition, difficulty, grid_seed):
     """Create grid from condition array using actual images"""
-    global grid_stimuli, grid_covers, grid_positions, question_mark, score_text, timer_text
+    global grid_stimuli, grid_covers, grid_positions, grid_draw_list, question_mark, score_text, timer_text
     
-    # Grid setup - 8x8 physical grid
-    physical_grid_size = 8
-    cell_size = 70
-    grid_spacing = 80
+    condition = np.asarray(condition, dtype=int)
+    image_counts = np.array([len(images[name]) for name in _CATEGORY_NAMES])
+    grid_rng = np.random.default_rng(grid_seed)
     
-    # Calculate grid position (center of screen)
-    start_x = -(physical_grid_size - 1) * grid_spacing / 2
-    start_y = (physical_grid_size - 1) * grid_spacing / 2
+    if difficulty == 'medium':
+        # 16-element 4x4 pattern: one image per logical cell, shown as a 2x2 block
+        cells = condition.reshape(4, 4)
+        image_idx = grid_rng.integers(0, image_counts[cells])
+        block = np.ones((2, 2), dtype=int)
+        cells = np.kron(cells, block)
+        image_idx = np.kron(image_idx, block)
+    else:  # hard difficulty - 64-element array maps directly onto the 8x8 grid
+        cells = condition.reshape(GRID_SIZE, GRID_SIZE)
+        image_idx = grid_rng.integers(0, image_counts[cells])
+    
+    categories = _CATEGORY_NAMES[cells.ravel()]
+    image_idx = image_idx.ravel()
     
     grid_stimuli = []
-    grid_covers = []
+    grid_covers = _COVER_POOL
     grid_positions.clear()
     
-    # Convert condition to categories
-    if difficulty == 'medium':
-        # condition is a 16-element array representing 4x4 pattern
-        condition_categories = [CATEGORY_MAP[num] for num in condition]
+    for i, (pos, category, idx) in enumerate(zip(_POS.tolist(), categories.tolist(), image_idx.tolist())):
+        grid_positions.append(tuple(pos))
+        image_path = images[category][idx]
         
-        # Each position in 4x4 becomes a 2x2 block in 8x8
-        for med_row in range(4):
-            for med_col in range(4):
-                category = condition_categories[med_row * 4 + med_col]
-                # Randomly select one image from this category
-                selected_image_idx = random.randint(0, len(images[category]) - 1)
-                
-                # Fill 2x2 block with this image
-                for block_row in range(2):
-                    for block_col in range(2):
-                        row = med_row * 2 + block_row
-                        col = med_col * 2 + block_col
-                        x_pos = start_x + col * grid_spacing
-                        y_pos = start_y - row * grid_spacing
-                        
-                        grid_positions.append((x_pos, y_pos))
-                        
-                        # Create stimulus
-                        if images[category][selected_image_idx].startswith('placeholder_'):
-                            # Use colored rectangle
-                            category_colors = {
-                                'face': 'orange',
-                                'limb': 'green', 
-                                'house': 'purple',
-                                'car': 'yellow'
-                            }
-                            stimulus = visual.Rect(win=win, width=cell_size, height=cell_size,
-                                                 fillColor=category_colors[category], 
-                                                 lineColor='white', lineWidth=2,
-                                                 pos=[x_pos, y_pos])
-                            
-                            text_stim = visual.TextStim(win, text=category[0].upper(), pos=[x_pos, y_pos],
-                                                      color='black', height=24, bold=True)
-                            
-                            grid_stimuli.append({'rect': stimulus, 'text': text_stim, 'category': category, 'image_type': 'rect'})
-                        else:
-                            # Use actual image
-                            img_stim = visual.ImageStim(win, image=images[category][selected_image_idx],
-                                                      pos=[x_pos, y_pos], size=(cell_size, cell_size))
-                            
-                            grid_stimuli.append({'image': img_stim, 'category': category, 'image_type': 'image'})
-                        
-                        # Create cover
-                        cover = visual.Rect(win=win, width=cell_size, height=cell_size,
-                                          fillColor='gray', lineColor='white', lineWidth=2,
-                                          pos=[x_pos, y_pos])
-                        grid_covers.append(cover)
-    
-    else:  # hard difficulty - use 64-element array directly for 8x8 grid
-        condition_categories = [CATEGORY_MAP[num] for num in condition]
-        
-        for row in range(physical_grid_size):
-            for col in range(physical_grid_size):
-                x_pos = start_x + col * grid_spacing
-                y_pos = start_y - row * grid_spacing
-                
-                grid_positions.append((x_pos, y_pos))
-                
-                idx = row * physical_grid_size + col
-                category = condition_categories[idx]
-                selected_image_idx = random.randint(0, len(images[category]) - 1)
-                
-                # Create stimulus
-                if images[category][selected_image_idx].startswith('placeholder_'):
-                    # Use colored rectangle
-                    category_colors = {
-                        'face': 'orange',
-                        'limb': 'green', 
-                        'house': 'purple',
-                        'car': 'yellow'
-                    }
-                    stimulus = visual.Rect(win=win, width=cell_size, height=cell_size,
-                                         fillColor=category_colors[category], 
-                                         lineColor='white', lineWidth=2,
-                                         pos=[x_pos, y_pos])
-                    
-                    text_stim = visual.TextStim(win, text=category[0].upper(), pos=[x_pos, y_pos],
-                                              color='black', height=24, bold=True)
-                    
-                    grid_stimuli.append({'rect': stimulus, 'text': text_stim, 'category': category, 'image_type': 'rect'})
-                else:
-                    # Use actual image
-                    img_stim = visual.ImageStim(win, image=images[category][selected_image_idx],
-                                              pos=[x_pos, y_pos], size=(cell_size, cell_size))
-                    
-                    grid_stimuli.append({'image': img_stim, 'category': category, 'image_type': 'image'})
-                
-                # Create cover
-                cover = visual.Rect(win=win, width=cell_size, height=cell_size,
-                                  fillColor='gray', lineColor='white', lineWidth=2,
-                                  pos=[x_pos, y_pos])
-                grid_covers.append(cover)
+        if image_path.startswith('placeholder_'):
+            # Use colored rectangle
+            rect = _RECT_POOL[i]
+            rect.fillColor = _CATEGORY_COLORS[category]
+            label = _LABEL_POOL[i]
+            if label.text != category[0].upper():
+                label.text = category[0].upper()
+            
+            grid_stimuli.append({'rect': rect, 'text': label, 'category': category, 'image_type': 'rect'})
+        else:
+            # Use actual image; only reload when this slot held a different one
+            img_stim = _IMAGE_POOL[i]
+            if _pool_image_paths[i] != image_path:
+                img_stim.image = image_arrays[category][idx]
+                _pool_image_paths[i] = image_path
+            
+            grid_stimuli.append({'image': img_stim, 'category': category, 'image_type': 'image'})
+    
+    # Flatten to plain draw calls so the study loop doesn't branch per cell
+    grid_draw_list = []
+    for stim in grid_stimuli:
+        if stim['image_type'] == 'rect':
+            grid_draw_list += [stim['rect'].draw, stim['text'].draw]
+        else:
+            grid_draw_list.append(stim['image'].draw)
     
     # Question mark for recall phase
     question_mark = visual.TextStim(win, text='??', color='red', height=30, bold=True)
@@ -552,10 +678,39 @@ local_gaze_stats = {
     'last_valid_gaze': None
 }
 
+# Recall response keys, and every key the round loops watch
+RESPONSE_KEYS = {
+    pyglet_key.H: 'house',
+    pyglet_key.C: 'car',
+    pyglet_key.F: 'face',
+    pyglet_key.L: 'limb'
+}
+_WATCHED_KEYS = (pyglet_key.ESCAPE,) + tuple(RESPONSE_KEYS)
+_held_keys = set()
+
+def poll_key_presses():
+    """Return the watched keys that went down since the previous poll"""
+    global _held_keys
+    
+    held = {code for code in _WATCHED_KEYS if key_state[code]}
+    pressed = held - _held_keys
+    _held_keys = held
+    return pressed
+
+# Newest sample and the frame it was fetched for (win.lastFrameT, updated by every flip)
+_last_frame_sample = [None, -1.0]
+_last_remote_frame = [-1.0]
+
 def update_local_gaze_display():
     """Update local gaze marker based on own eye tracking data using corrected formula"""
     global local_gaze_stats
     
+    # Poll the tracker at most once per displayed frame; a repeat call would
+    # only fetch, redraw and resend the same sample
+    frame = win.lastFrameT
+    if _last_frame_sample[1] == frame:
+        return
+    
     local_gaze_stats['total_attempts'] += 1
     
     sample = None
@@ -563,6 +718,7 @@ def update_local_gaze_display():
         sample = el_tracker.getNewestSample()
     except Exception as e:
         pass
+    _last_frame_sample[:] = [sample, frame]
     
     if sample is not None:
         local_gaze_stats['samples_received'] += 1
@@ -587,10 +743,10 @@ def update_local_gaze_display():
             
             try:
                 # Use the corrected formula provided
-                gaze_x = (1.2 * gaze_data[0] - scn_width/2 + 400 - 60)
-                gaze_y = (scn_height/2 - 1.2 * gaze_data[1] + 200 - 25)
+                gaze_x = _AX * gaze_data[0] + _BX
+                gaze_y = _AY * gaze_data[1] + _BY
                 
-                if abs(gaze_x) <= scn_width/2 and abs(gaze_y) <= scn_height/2:
+                if -_XLIM <= gaze_x <= _XLIM and -_YLIM <= gaze_y <= _YLIM:
                     local_gaze_marker.setPos([gaze_x, gaze_y])
                     send_gaze_data(gaze_data[0], gaze_data[1], True)
                     
@@ -602,16 +758,22 @@ def update_local_gaze_display():
 
 def update_remote_gaze_display():
     """Update remote gaze marker based on received data from Computer B"""
-    global remote_gaze_data
+    # The marker position only needs computing once per displayed frame
+    frame = win.lastFrameT
+    if _last_remote_frame[0] == frame:
+        return
+    _last_remote_frame[0] = frame
+    
+    x, y, valid, rx = remote_gaze_buf[remote_gaze_idx[0]].tolist()
     
-    if remote_gaze_data.get('valid', False):
-        if time.time() - remote_gaze_data.get('timestamp', 0) < 0.1:
+    if valid:
+        if time.monotonic() - rx < 0.1:
             try:
                 # Use the same corrected formula for consistency
-                gaze_x = (1.2 * remote_gaze_data['x'] - scn_width/2 + 400 - 60)
-                gaze_y = (scn_height/2 - 1.2 * remote_gaze_data['y'] + 200 - 25)
+                gaze_x = _AX * x + _BX
+                gaze_y = _AY * y + _BY
                 
-                if abs(gaze_x) <= scn_width/2 and abs(gaze_y) <= scn_height/2:
+                if -_XLIM <= gaze_x <= _XLIM and -_YLIM <= gaze_y <= _YLIM:
                     remote_gaze_marker.setPos([gaze_x, gaze_y])
                     
             except Exception as e:
@@ -627,67 +789,80 @@ def run_competitive_round():
     difficulty = 'medium' if current_round <= 5 else 'hard'  # First 5 rounds medium, rest hard
     condition = random.choice(conditions[difficulty])
     target_position = random.randint(0, 63)  # 64 physical positions
+    grid_seed = int(rng.integers(2**31))  # picks A's image files; B rebuilds categories from condition
     
     game_sync_data = {
         'round': current_round,
         'target_pos': target_position,
+        'grid_seed': grid_seed,
         'condition': condition,
         'difficulty': difficulty,
         'responses': {}
     }
+    b_response_event.clear()
     
     # Send game parameters to Computer B
     send_game_data('round_start', {
         'round': current_round,
         'target_pos': target_position,
+        'grid_seed': grid_seed,
         'condition': condition,
         'difficulty': difficulty
     })
     
     # Create grid with condition
-    create_grid_from_condition(condition, difficulty)
+    create_grid_from_condition(condition, difficulty, grid_seed)
     target_category = grid_stimuli[target_position]['category']
     
     el_tracker.sendMessage(f"ROUND_{current_round}_START_TARGET_{target_position}_CATEGORY_{target_category}_DIFFICULTY_{difficulty}")
     
+    # Last values rendered into timer_text/score_text, so setText only runs on change
+    last_timer_tenths = None
+    last_score_key = None
+    
+    # Local aliases for the calls made every frame below
+    get_time = core.getTime
+    flip = win.flip  # also clears the back buffer for the next frame
+    
+    # Sync key state so keys still held from the previous screen don't count as presses
+    poll_key_presses()
+    
     # Study phase (5 seconds)
     game_state = 'study'
-    study_start = core.getTime()
+    study_start = get_time()
     
-    while core.getTime() - study_start < 5.0:
+    while get_time() - study_start < 5.0:
         update_local_gaze_display()
         update_remote_gaze_display()
         
-        win.clearBuffer()
-        
         # Draw game grid
-        for stim in grid_stimuli:
-            if stim['image_type'] == 'rect':
-                stim['rect'].draw()
-                stim['text'].draw()
-            else:
-                stim['image'].draw()
+        for draw in grid_draw_list:
+            draw()
         
         # Draw gaze markers (small and unobtrusive)
         local_gaze_marker.draw()
-        if remote_gaze_data.get('valid', False):
+        if remote_gaze_buf[remote_gaze_idx[0], REMOTE_VALID]:
             remote_gaze_marker.draw()
         
-        # Draw timer
-        time_left = 5.0 - (core.getTime() - study_start)
-        timer_text.setText(f"Study Time: {time_left:.1f}s")
+        # Draw timer (text only changes every 0.1s)
+        time_left = 5.0 - (get_time() - study_start)
+        timer_tenths = int(time_left * 10)
+        if timer_tenths != last_timer_tenths:
+            timer_text.setText(f"Study Time: {timer_tenths / 10:.1f}s")
+            last_timer_tenths = timer_tenths
         timer_text.draw()
         
-        # Draw score
-        score_text.setText(f"Round {current_round}/{total_rounds} | Team Score: {player_scores['A']}")
+        # Draw score (re-rendered only when round or score changes)
+        score_key = (current_round, player_scores['A'])
+        if score_key != last_score_key:
+            score_text.setText(f"Round {current_round}/{total_rounds} | Team Score: {player_scores['A']}")
+            last_score_key = score_key
         score_text.draw()
         
-        win.flip()
-        core.wait(0.016)
+        flip()  # blocks on vblank, paces the loop at the refresh rate
         
         # Check for escape
-        keys = event.getKeys()
-        if 'escape' in keys:
+        if pyglet_key.ESCAPE in poll_key_presses():
             return None
     
     el_tracker.sendMessage(f"ROUND_{current_round}_STUDY_END")
@@ -701,15 +876,13 @@ def run_competitive_round():
     
     response = None
     response_time = None
-    recall_start = core.getTime()
+    recall_start = get_time()
     
     # No time limit - wait for user response
     while response is None:
         update_local_gaze_display()
         update_remote_gaze_display()
         
-        win.clearBuffer()
-        
         # Draw covered grid
         for cover in grid_covers:
             cover.draw()
@@ -719,37 +892,32 @@ def run_competitive_round():
         
         # Draw gaze markers
         local_gaze_marker.draw()
-        if remote_gaze_data.get('valid', False):
+        if remote_gaze_buf[remote_gaze_idx[0], REMOTE_VALID]:
             remote_gaze_marker.draw()
         
         # Draw instructions
-        instruction_text = visual.TextStim(win, text='H=House  C=Car  F=Face  L=Limb', 
-                                         pos=[0, -scn_height//2 + 30], color='white', height=16)
         instruction_text.draw()
         
-        # Draw score
-        score_text.setText(f"Round {current_round}/{total_rounds} | Team Score: {player_scores['A']}")
+        # Draw score (re-rendered only when round or score changes)
+        score_key = (current_round, player_scores['A'])
+        if score_key != last_score_key:
+            score_text.setText(f"Round {current_round}/{total_rounds} | Team Score: {player_scores['A']}")
+            last_score_key = score_key
         score_text.draw()
         
-        win.flip()
-        core.wait(0.016)
+        flip()  # blocks on vblank, paces the loop at the refresh rate
         
         # Check for response
-        keys = event.getKeys()
-        if 'h' in keys:
-            response = 'house'
-            response_time = core.getTime() - recall_start
-        elif 'c' in keys:
-            response = 'car'
-            response_time = core.getTime() - recall_start
-        elif 'f' in keys:
-            response = 'face'
-            response_time = core.getTime() - recall_start
-        elif 'l' in keys:
-            response = 'limb'
-            response_time = core.getTime() - recall_start
-        elif 'escape' in keys:
-            return None
+        pressed = poll_key_presses()
+        if pressed:
+            for code, answer in RESPONSE_KEYS.items():
+                if code in pressed:
+                    response = answer
+                    response_time = get_time() - recall_start
+                    break
+            else:
+                if pyglet_key.ESCAPE in pressed:
+                    return None
     
     # Record our response
     if response:
@@ -761,12 +929,8 @@ def run_competitive_round():
         send_game_data('response', game_sync_data['responses']['A'])
         el_tracker.sendMessage(f"ROUND_{current_round}_RESPONSE_A_{response}_{response_time:.3f}")
     
-    # Wait for both responses or timeout
-    wait_start = time.time()
-    while time.time() - wait_start < 3.0:  # Wait up to 3 seconds for other player
-        if 'B' in game_sync_data['responses']:
-            break
-        time.sleep(0.01)
+    # Wait up to 3 seconds for the other player (returns at once if B already answered)
+    b_response_event.wait(timeout=3.0)
     
     # Determine winner and scoring - CORRECTED LOGIC
     a_response = game_sync_data['responses'].get('A')
@@ -821,14 +985,12 @@ def run_competitive_round():
     
     # Show feedback (3 seconds)
     game_state = 'feedback'
-    feedback_start = core.getTime()
+    feedback_start = get_time()
     
-    while core.getTime() - feedback_start < 3.0:
+    while get_time() - feedback_start < 3.0:
         update_local_gaze_display()
         update_remote_gaze_display()
         
-        win.clearBuffer()
-        
         # Show correct answer
         if grid_stimuli[target_position]['image_type'] == 'rect':
             grid_stimuli[target_position]['rect'].draw()
@@ -843,7 +1005,7 @@ def run_competitive_round():
         
         # Draw gaze markers
         local_gaze_marker.draw()
-        if remote_gaze_data.get('valid', False):
+        if remote_gaze_buf[remote_gaze_idx[0], REMOTE_VALID]:
             remote_gaze_marker.draw()
         
         # Draw feedback
@@ -858,16 +1020,17 @@ def run_competitive_round():
                                       color=feedback_color, height=20, bold=True)
         feedback_text.draw()
         
-        # Draw score
-        score_text.setText(f"Round {current_round}/{total_rounds} | Team Score: {player_scores['A']}")
+        # Draw score (re-rendered only when round or score changes)
+        score_key = (current_round, player_scores['A'])
+        if score_key != last_score_key:
+            score_text.setText(f"Round {current_round}/{total_rounds} | Team Score: {player_scores['A']}")
+            last_score_key = score_key
         score_text.draw()
         
-        win.flip()
-        core.wait(0.016)
+        flip()  # blocks on vblank, paces the loop at the refresh rate
         
         # Check for escape
-        keys = event.getKeys()
-        if 'escape' in keys:
+        if pyglet_key.ESCAPE in poll_key_presses():
             return None
     
     el_tracker.sendMessage(f"ROUND_{current_round}_END")
@@ -888,6 +1051,8 @@ def show_msg(win, text, wait_for_keypress=True):
     clear_screen(win)
     
     if wait_for_keypress:
+        # Round loops read pyglet key state, so drop keys PsychoPy queued meanwhile
+        event.clearEvents('keyboard')
         while True:
             win.clearBuffer()
             msg.draw()
@@ -7,43 +7,86 @@ SIMPLIFIED VERSION: Single calibration, medium difficulty only
 UPDATED: PNG support, correct plurals, single-player fallback
 """
 
-import pylink
 import os
 import platform
-import random
 import time
 import sys
 import numpy as np
 import socket
+import struct
+import ctypes
+import collections
+import selectors
+import functools
+import contextlib
 import threading
 import json
-from psychopy import visual, core, event, monitors, gui
-from EyeLinkCoreGraphicsPsychoPy import EyeLinkCoreGraphicsPsychoPy
-from PIL import Image
+# Only what the EDF filename dialog needs is imported up front; pylink,
+# PIL and the display modules are imported where they are first used
+from psychopy import core, gui
 from string import ascii_letters, digits
 
+try:
+    import orjson  # optional, faster encode/decode of game sync messages
+except ImportError:
+    orjson = None
+
 # Network Configuration
 LOCAL_IP = "100.1.1.10"  # Computer A's IP
 REMOTE_IP = "100.1.1.11"  # Computer B's IP
 GAZE_PORT = 8888
 SEND_PORT = 8889
 GAME_PORT = 8890  # Port for game synchronization
+SOCKET_BUFFER_SIZE = 4 * 1024 * 1024  # requested kernel buffer per socket (the kernel may cap it)
 
 # Global variables
 el_tracker = None
 win = None
-remote_gaze_data = {'x': 0, 'y': 0, 'valid': False, 'timestamp': 0}
+remote_gaze = (0.0, 0.0, 0, False)  # latest from Computer B: (x, y, timestamp, valid), replaced whole
 network_stats = {'sent': 0, 'received': 0, 'errors': 0}
 
+# Binary gaze packet: x, y, monotonic timestamp (ns), valid, sent-by-A flag
+_gaze_struct = struct.Struct('<ddq??')
+
+# Gaze packets queued during a frame, sent together by _flush_gaze before each flip
+_pending_gaze = collections.deque(maxlen=64)
+
+# Game sync messages stay JSON: orjson when installed, else one shared compact encoder
+_compact_json = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+
 # Game variables
 game_state = 'waiting'
 current_round = 0
 total_rounds = 10
 grid_layout = []  # Will store the 8x8 grid layout
-grid_positions = []
+GRID_SIZE = 8  # 8x8 physical grid representing the 4x4 logical pattern
+GRID_CELL_SIZE = 70
+grid_positions = None  # (64, 2) float32 cell centres, set once the window size is known
 trial_results = []
 game_sync_data = {'round': 0, 'target_pos': 0, 'grid_seed': 0, 'responses': {}}
 player_scores = {'A': 0, 'B': 0}
+b_response_event = threading.Event()  # set when Computer B's response for this round arrives
+
+# First responder, keyed by (A responded, B responded, A answered faster than B)
+_FIRST_PLAYER = {
+    (True, True, True): 'A',
+    (True, True, False): 'B',
+    (True, False, False): 'A',
+    (False, True, False): 'B',
+    (False, False, False): None
+}
+
+# Round outcome codes stored in round_result['winner']; text only when shown or saved
+WIN_NONE, WIN_A_OK, WIN_B_OK, WIN_A_FAIL, WIN_B_FAIL = range(5)
+_WIN_STR = (
+    'Team failed (Player None first, wrong answer)',
+    'Team (Player A first)',
+    'Team (Player B first)',
+    'Team failed (Player A first, wrong answer)',
+    'Team failed (Player B first, wrong answer)'
+)
+_WIN_OK = {'A': WIN_A_OK, 'B': WIN_B_OK}
+_WIN_FAIL = {'A': WIN_A_FAIL, 'B': WIN_B_FAIL}
 
 # Single player mode variables
 single_player_mode = False
@@ -54,6 +97,9 @@ connection_timeout = 5.0  # seconds to wait for Computer B
 game_send_socket = None
 game_receive_socket = None
 
+# Closers for every socket actually opened; terminate_task runs them all
+_cleanup = contextlib.ExitStack()
+
 # Image and condition variables
 images = {
     'face': [],
@@ -134,6 +180,10 @@ session_folder = os.path.join(results_folder, session_identifier)
 if not os.path.exists(session_folder):
     os.makedirs(session_folder)
 
+# Output files for this session
+RESULTS_PATH = os.path.join(session_folder, f"{session_identifier}_competitive_results.txt")
+LOCAL_EDF_PATH = os.path.join(session_folder, session_identifier + '.EDF')
+
 # Load conditions from JSON file
 def load_conditions():
     """Load conditions from dyad_conditions.json"""
@@ -157,6 +207,15 @@ def load_conditions():
             'medium': [[2, 0, 1, 3, 2, 3, 0, 1, 3, 1, 2, 1, 0, 2, 0, 3]]
         }
 
+@functools.lru_cache(maxsize=64)
+def _load_texture(path):
+    """Decode an image once, at cell size, as a PsychoPy-ready array"""
+    from PIL import Image
+    
+    # Rows are flipped because PsychoPy draws array row 0 at the bottom
+    pixels = Image.open(path).convert('RGB').resize((GRID_CELL_SIZE, GRID_CELL_SIZE))
+    return np.flipud(np.asarray(pixels, dtype=np.float32)) / 127.5 - 1.0
+
 def load_all_images():
     """Load all images from stimuli folder - FIXED: PNG support and correct plurals"""
     global images
@@ -183,7 +242,8 @@ def load_all_images():
                 
                 if os.path.exists(image_path):
                     try:
-                        # Don't create ImageStim here, just store the path
+                        # Decode now so rounds never touch disk
+                        _load_texture(image_path)
                         images[category_key].append(image_path)
                         if i == 0:  # Only print for first image of each category
                             print(f"✓ Found {folder_name} images")
@@ -203,6 +263,15 @@ def load_all_images():
 load_conditions()
 load_all_images()
 
+# Draw the whole session's randomness up front from one seeded generator
+session_seed = np.random.SeedSequence().entropy
+_rng = np.random.default_rng(session_seed)
+# Image picks are reduced modulo each category's image count when used
+_preselected_images = _rng.integers(0, 2**31, size=(total_rounds, 16)).tolist()
+_preselected_targets = _rng.integers(0, GRID_SIZE * GRID_SIZE, size=total_rounds).tolist()
+_preselected_conditions = _rng.integers(0, len(conditions['medium']), size=total_rounds).tolist()
+print(f"✓ Session randomness drawn (seed {session_seed})")
+
 def test_network_connection():
     """Test if Computer B is reachable"""
     global network_connected
@@ -246,24 +315,39 @@ def setup_network():
     try:
         # Gaze data sockets
         send_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        _cleanup.callback(send_socket.close)
         send_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # Room for a whole sendmmsg batch
+        send_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+        send_socket.connect((REMOTE_IP, SEND_PORT))
         print(f"✓ Gaze send socket created for {REMOTE_IP}:{SEND_PORT}")
         
         receive_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        _cleanup.callback(receive_socket.close)
         receive_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, 'SO_REUSEPORT'):
+            receive_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        # Large receive buffer so packets survive stalls in the receive thread
+        receive_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
         receive_socket.bind((LOCAL_IP, GAZE_PORT))
-        receive_socket.settimeout(0.001)
-        print(f"✓ Gaze receive socket bound to {LOCAL_IP}:{GAZE_PORT}")
+        receive_socket.setblocking(False)
+        print(f"✓ Gaze receive socket bound to {LOCAL_IP}:{GAZE_PORT} "
+              f"(receive buffer {receive_socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)} bytes)")
         
         # Game synchronization sockets
         game_send_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        _cleanup.callback(game_send_socket.close)
         game_send_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         print(f"✓ Game send socket created for {REMOTE_IP}:{GAME_PORT + 1}")
         
         game_receive_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        _cleanup.callback(game_receive_socket.close)
         game_receive_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, 'SO_REUSEPORT'):
+            game_receive_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        game_receive_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
         game_receive_socket.bind((LOCAL_IP, GAME_PORT))
-        game_receive_socket.settimeout(0.001)
+        game_receive_socket.setblocking(False)
         print(f"✓ Game receive socket bound to {LOCAL_IP}:{GAME_PORT}")
         
         return True
@@ -281,21 +365,69 @@ def send_gaze_data(gaze_x, gaze_y, valid=True):
         return
     
     try:
-        data = {
-            'x': float(gaze_x),
-            'y': float(gaze_y),
-            'valid': valid,
-            'timestamp': time.time(),
-            'computer': 'A'
-        }
-        
-        message = json.dumps(data).encode('utf-8')
-        send_socket.sendto(message, (REMOTE_IP, SEND_PORT))
-        network_stats['sent'] += 1
+        _pending_gaze.append(_gaze_struct.pack(float(gaze_x), float(gaze_y), time.monotonic_ns(), bool(valid), True))
         
     except Exception as e:
         network_stats['errors'] += 1
 
+# sendmmsg(2) structures, so a frame's gaze packets go out in one syscall on Linux
+class _iovec(ctypes.Structure):
+    _fields_ = [('iov_base', ctypes.c_void_p), ('iov_len', ctypes.c_size_t)]
+
+class _msghdr(ctypes.Structure):
+    _fields_ = [('msg_name', ctypes.c_void_p), ('msg_namelen', ctypes.c_uint32),
+                ('msg_iov', ctypes.POINTER(_iovec)), ('msg_iovlen', ctypes.c_size_t),
+                ('msg_control', ctypes.c_void_p), ('msg_controllen', ctypes.c_size_t),
+                ('msg_flags', ctypes.c_int)]
+
+class _mmsghdr(ctypes.Structure):
+    _fields_ = [('msg_hdr', _msghdr), ('msg_len', ctypes.c_uint)]
+
+_sendmmsg = None
+if platform.system() == 'Linux':
+    try:
+        _sendmmsg = ctypes.CDLL(None, use_errno=True).sendmmsg
+        _sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_mmsghdr), ctypes.c_uint, ctypes.c_int]
+        _sendmmsg.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _sendmmsg = None
+
+def _send_batch(batch):
+    """Send a list of packed gaze packets, with one sendmmsg call where available"""
+    if _sendmmsg is None:
+        for message in batch:
+            send_socket.send(message)
+        return len(batch)
+    
+    # send_socket is connected, so no per-message destination is needed
+    buffers = [ctypes.create_string_buffer(message, len(message)) for message in batch]
+    iovecs = (_iovec * len(batch))()
+    msgs = (_mmsghdr * len(batch))()
+    for i, buf in enumerate(buffers):
+        iovecs[i].iov_base = ctypes.addressof(buf)
+        iovecs[i].iov_len = len(batch[i])
+        msgs[i].msg_hdr.msg_iov = ctypes.pointer(iovecs[i])
+        msgs[i].msg_hdr.msg_iovlen = 1
+    
+    sent = _sendmmsg(send_socket.fileno(), msgs, len(batch), 0)
+    if sent < 0:
+        raise OSError(ctypes.get_errno(), 'sendmmsg failed')
+    return sent
+
+def _flush_gaze():
+    """Send all gaze packets queued since the last flip"""
+    global network_stats
+    
+    if single_player_mode or not _pending_gaze:
+        return
+    
+    batch = list(_pending_gaze)
+    _pending_gaze.clear()
+    try:
+        network_stats['sent'] += _send_batch(batch)
+    except Exception as e:
+        network_stats['errors'] += 1
+
 def send_game_data(data_type, data):
     """Send game synchronization data to Computer B (only if not in single player mode)"""
     if single_player_mode:
@@ -309,56 +441,68 @@ def send_game_data(data_type, data):
             'from': 'A'
         }
         
-        encoded = json.dumps(message).encode('utf-8')
+        encoded = orjson.dumps(message) if orjson else _compact_json(message).encode('utf-8', 'replace')
         game_send_socket.sendto(encoded, (REMOTE_IP, GAME_PORT + 1))
         
     except Exception as e:
         print(f"Game send error: {e}")
 
-def receive_gaze_data():
-    """Continuously receive gaze data from Computer B (only if not in single player mode)"""
-    global remote_gaze_data, network_stats
-    
-    if single_player_mode:
-        return
+def _handle_gaze(sock):
+    """Drain all queued gaze packets from Computer B and keep only the newest"""
+    global remote_gaze, network_stats
     
+    latest = None
     while True:
         try:
-            data, addr = receive_socket.recvfrom(1024)
-            gaze_info = json.loads(data.decode('utf-8'))
-            
-            if gaze_info.get('computer') == 'B':
-                remote_gaze_data.update(gaze_info)
-                network_stats['received'] += 1
-                
-        except socket.timeout:
-            continue
+            data = sock.recv(1024)
+        except BlockingIOError:
+            break
         except Exception as e:
             network_stats['errors'] += 1
-            time.sleep(0.001)
+            break
+        
+        if len(data) == _gaze_struct.size and not data[-1]:  # sent-by-A flag clear
+            latest = data
+            network_stats['received'] += 1
+    
+    # Older packets in the backlog would be overwritten anyway, so unpack once
+    if latest is not None:
+        x, y, timestamp, valid, from_a = _gaze_struct.unpack_from(latest)
+        remote_gaze = (x, y, timestamp, valid)
 
-def receive_game_data():
-    """Continuously receive game synchronization data (only if not in single player mode)"""
+def _handle_game(sock):
+    """Drain all queued game synchronization messages"""
     global game_sync_data
     
-    if single_player_mode:
-        return
-    
     while True:
         try:
-            data, addr = game_receive_socket.recvfrom(1024)
-            message = json.loads(data.decode('utf-8'))
+            data = sock.recv(1024)
+        except BlockingIOError:
+            break
+        except Exception as e:
+            break
+        
+        try:
+            message = orjson.loads(data) if orjson else json.loads(data.decode('utf-8'))
             
             if message.get('from') == 'B':
                 if message['type'] == 'response':
                     game_sync_data['responses']['B'] = message['data']
+                    b_response_event.set()
                 elif message['type'] == 'ready':
                     game_sync_data['b_ready'] = True
-                    
-        except socket.timeout:
-            continue
         except Exception as e:
-            time.sleep(0.001)
+            continue
+
+def receive_network_data():
+    """Single receive thread: wait until either socket is readable, then drain it"""
+    sel = selectors.DefaultSelector()
+    sel.register(receive_socket, selectors.EVENT_READ, _handle_gaze)
+    sel.register(game_receive_socket, selectors.EVENT_READ, _handle_game)
+    
+    while True:
+        for key, _ in sel.select(timeout=0.01):
+            key.data(key.fileobj)
 
 # Start network setup
 if not setup_network():
@@ -367,17 +511,30 @@ if not setup_network():
 
 # Start receiving threads (only if not in single player mode)
 if not single_player_mode:
-    receive_thread = threading.Thread(target=receive_gaze_data, daemon=True)
+    receive_thread = threading.Thread(target=receive_network_data, daemon=True)
     receive_thread.start()
 
-    game_receive_thread = threading.Thread(target=receive_game_data, daemon=True)
-    game_receive_thread.start()
-
     print("✓ Network communication started")
 else:
     print("✓ Single player mode active")
 
+# Results file, opened now so each round is appended as soon as it finishes
+# Columns depend on the mode, so the row template is fixed here too
+if single_player_mode:
+    RESULTS_HEADER = "Round\tDifficulty\tPosition\tTarget\tA_Response\tA_Time\tCorrect\tPoints\tMode\n"
+    RESULTS_ROW_FMT = ("{round}\t{difficulty}\t{target_position}\t{target_category}\t"
+                       "{a_resp}\t{a_time}\t{correct}\t{points_awarded}\t{mode}\n")
+else:
+    RESULTS_HEADER = "Round\tDifficulty\tPosition\tTarget\tA_Response\tA_Time\tB_Response\tB_Time\tWinner\tPoints\tMode\n"
+    RESULTS_ROW_FMT = ("{round}\t{difficulty}\t{target_position}\t{target_category}\t"
+                       "{a_resp}\t{a_time}\t{b_resp}\t{b_time}\t{winner_str}\t{points_awarded}\t{mode}\n")
+results_fh = open(RESULTS_PATH, 'w', buffering=1 << 16)
+results_fh.write(RESULTS_HEADER)
+results_fh.flush()
+
 # Connect to EyeLink
+import pylink
+
 print("\n1. CONNECTING TO EYELINK")
 print("-" * 30)
 if dummy_mode:
@@ -439,14 +596,32 @@ mode_str = "single player" if single_player_mode else "competitive"
 print(f"✓ Tracker configured for {mode_str} game recording")
 
 # Set up display
+from psychopy import visual, event, monitors
+from psychopy.hardware import keyboard
+import pyglet.gl as GL
+from EyeLinkCoreGraphicsPsychoPy import EyeLinkCoreGraphicsPsychoPy
+
 print("\n3. SETTING UP DISPLAY")
 print("-" * 25)
 mon = monitors.Monitor('myMonitor', width=53.0, distance=70.0)
-win = visual.Window(fullscr=full_screen, monitor=mon, winType='pyglet', units='pix', color=[0, 0, 0])
+win = visual.Window(fullscr=full_screen, monitor=mon, winType='pyglet', units='pix', color=[0, 0, 0],
+                    waitBlanking=True)
+
+# Keyboard device for all key polling (uses the Psychtoolbox backend when available)
+kb = keyboard.Keyboard()
+
+# Recall phase response keys
+RESPONSE_KEY_MAP = {'h': 'house', 'c': 'car', 'f': 'face', 'l': 'limb'}
+RECALL_KEYS = list(RESPONSE_KEY_MAP) + ['escape']
 
 scn_width, scn_height = win.size
 print(f"✓ Window: {scn_width} x {scn_height}")
 
+# Measured refresh rate, so fixed-length displays can count frames instead of polling a clock
+frame_rate = win.getActualFrameRate() or 60.0
+FEEDBACK_FRAMES = int(round(3.0 * frame_rate))  # 3-second feedback display
+print(f"✓ Refresh rate: {frame_rate:.1f} Hz")
+
 if 'Darwin' in platform.system() and use_retina:
     scn_width = int(scn_width/2.0)
     scn_height = int(scn_height/2.0)
@@ -478,99 +653,149 @@ print("\n4. CREATING VISUAL ELEMENTS")
 print("-" * 30)
 
 # Gaze markers (smaller, less prominent) - Different colors for Computer A
-local_gaze_marker = visual.Circle(win=win, radius=8, fillColor='red', lineColor='white', lineWidth=1)
-remote_gaze_marker = visual.Circle(win=win, radius=8, fillColor='cyan', lineColor='white', lineWidth=1)
+# Both markers are drawn as two smooth GL points in one call: local (red) then
+# remote (cyan), each over a slightly larger white point as its outline
+MARKER_DIAMETER = 16
+_marker_xy = (GL.GLfloat * 4)()  # local x, y, remote x, y (pixels from screen centre)
+_marker_rgba = (GL.GLubyte * 8)(255, 0, 0, 255, 0, 255, 255, 255)
+
+def draw_gaze_markers(show_remote):
+    """Draw the local marker, and the remote one if show_remote"""
+    count = 2 if show_remote else 1
+    
+    GL.glPushMatrix()
+    win.setScale('pix')
+    GL.glEnable(GL.GL_POINT_SMOOTH)
+    GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+    GL.glVertexPointer(2, GL.GL_FLOAT, 0, _marker_xy)
+    
+    # White outline
+    GL.glPointSize(MARKER_DIAMETER + 2)
+    GL.glColor4ub(255, 255, 255, 255)
+    GL.glDrawArrays(GL.GL_POINTS, 0, count)
+    
+    # Fill colours
+    GL.glEnableClientState(GL.GL_COLOR_ARRAY)
+    GL.glColorPointer(4, GL.GL_UNSIGNED_BYTE, 0, _marker_rgba)
+    GL.glPointSize(MARKER_DIAMETER)
+    GL.glDrawArrays(GL.GL_POINTS, 0, count)
+    
+    GL.glDisableClientState(GL.GL_COLOR_ARRAY)
+    GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+    GL.glDisable(GL.GL_POINT_SMOOTH)
+    GL.glPopMatrix()
+
+# Tracker-to-window affine maps for the gaze markers, precomputed so each
+# frame's transform is one multiply-add per axis
+_LOCAL_AX, _LOCAL_BX = 1.2, -scn_width/2 + 400 - 60
+_LOCAL_AY, _LOCAL_BY = -1.2, scn_height/2 + 200 - 25
+_REMOTE_AX, _REMOTE_BX = -1.0, scn_width/2 - 50
+_REMOTE_AY, _REMOTE_BY = 1.0, -scn_height/2 - 200
 
 # Game grid elements - ONLY MEDIUM DIFFICULTY (4x4 logical patterns)
+# 8x8 physical grid covering 85% of the smaller screen dimension; fixed for the session
+GRID_SPACING = min(scn_width * 0.85, scn_height * 0.85) / GRID_SIZE
+_GRID_START_X = -(GRID_SIZE - 1) * GRID_SPACING / 2
+_GRID_START_Y = (GRID_SIZE - 1) * GRID_SPACING / 2
+
+# Cells are numbered block by block: each 2x2 block of the 4x4 pattern
+# takes four consecutive indices (top-left, top-right, bottom-left, bottom-right)
+_block, _sub = np.divmod(np.arange(GRID_SIZE * GRID_SIZE), 4)
+_grid_rows = (_block // 4) * 2 + _sub // 2
+_grid_cols = (_block % 4) * 2 + _sub % 2
+_grid_positions_np = np.stack([_GRID_START_X + _grid_cols * GRID_SPACING,
+                               _GRID_START_Y - _grid_rows * GRID_SPACING], axis=1).astype(np.float32)
+grid_positions = _grid_positions_np
+_GRID_POS_LIST = [tuple(pos) for pos in _grid_positions_np.tolist()]
+
+_CATEGORY_NAMES = np.array([CATEGORY_MAP[i] for i in range(len(CATEGORY_MAP))])
+_CATEGORY_COLORS = {
+    'face': 'orange',
+    'limb': 'green', 
+    'house': 'purple',
+    'car': 'yellow'
+}
+
+# Stimulus pools, one slot per cell, reused every round instead of rebuilt.
+# Cells never move, so positions are set here once.
+_IMAGE_POOL = [visual.ImageStim(win, image=None, pos=pos, size=(GRID_CELL_SIZE, GRID_CELL_SIZE))
+               for pos in _GRID_POS_LIST]
+_RECT_POOL = [visual.Rect(win=win, width=GRID_CELL_SIZE, height=GRID_CELL_SIZE,
+                          lineColor='white', lineWidth=2, pos=pos)
+              for pos in _GRID_POS_LIST]
+_LABEL_POOL = [visual.TextStim(win, text='', pos=pos, color='black', height=24, bold=True)
+               for pos in _GRID_POS_LIST]
+_COVER_POOL = [visual.Rect(win=win, width=GRID_CELL_SIZE, height=GRID_CELL_SIZE,
+                           fillColor='gray', lineColor='white', lineWidth=2, pos=pos)
+               for pos in _GRID_POS_LIST]
+_pool_image_paths = [None] * len(_IMAGE_POOL)  # image currently loaded in each slot
+
+# Special target cover (bright red for recall phase)
+target_cover = visual.Rect(win=win, width=GRID_CELL_SIZE, height=GRID_CELL_SIZE,
+                          fillColor='red', lineColor='white', lineWidth=3,
+                          pos=[0, 0])  # Position will be set during recall phase
+
+# Recall phase instructions (built once, drawn every frame)
+instruction_text = visual.TextStim(win, text='H=House  C=Car  F=Face  L=Limb', 
+                                 pos=[0, -scn_height//2 + 30], color='white', height=16)
+
+# Feedback text, one stim per colour so a round only ever changes the text
+feedback_stims = {
+    color: visual.TextStim(win, text='', pos=[0, -scn_height//2 + 60],
+                           color=color, height=20, bold=True)
+    for color in ('green', 'red')
+}
+
+# Score and timer displays
+score_text = visual.TextStim(win, text='', pos=[0, scn_height//2 - 30],
+                           color='white', height=20, bold=True)
+
+timer_text = visual.TextStim(win, text='', pos=[0, scn_height//2 - 60],
+                           color='yellow', height=24, bold=True)
+
 def create_grid_from_condition(condition):
     """Create grid from condition array using actual images - MEDIUM DIFFICULTY ONLY"""
-    global grid_stimuli, grid_covers, grid_positions, target_cover, score_text, timer_text
-    
-    # Grid setup - 8x8 physical grid representing 4x4 logical pattern
-    physical_grid_size = 8
-    cell_size = 70
-    
-    # Calculate grid spacing to cover most of the screen
-    # Use 85% of screen width and height, divided by grid size
-    available_width = scn_width * 0.85
-    available_height = scn_height * 0.85
-    
-    grid_spacing_x = available_width / physical_grid_size
-    grid_spacing_y = available_height / physical_grid_size
-    
-    # Use the smaller spacing to maintain square grid
-    grid_spacing = min(grid_spacing_x, grid_spacing_y)
-    
-    # Calculate grid position (center of screen)
-    start_x = -(physical_grid_size - 1) * grid_spacing / 2
-    start_y = (physical_grid_size - 1) * grid_spacing / 2
+    global grid_stimuli, grid_covers, grid_images, grid_rects, grid_texts
     
     grid_stimuli = []
-    grid_covers = []
-    grid_positions.clear()
-    
-    # Medium difficulty: condition is a 16-element array representing 4x4 pattern
-    condition_categories = [CATEGORY_MAP[num] for num in condition]
-    
-    # Each position in 4x4 becomes a 2x2 block in 8x8
-    for med_row in range(4):
-        for med_col in range(4):
-            category = condition_categories[med_row * 4 + med_col]
-            # Randomly select one image from this category
-            selected_image_idx = random.randint(0, len(images[category]) - 1)
+    # Same stimuli split by kind, so the study loop draws without branching per cell
+    grid_images = []
+    grid_rects = []
+    grid_texts = []
+    grid_covers = _COVER_POOL
+    
+    # Medium difficulty: condition is a 16-element array representing 4x4 pattern.
+    # Resolve each block's category and pre-drawn image in one array pass, then
+    # repeat per cell, since each 4x4 position becomes a 2x2 block in 8x8.
+    cells = np.asarray(condition, dtype=int)
+    image_counts = np.array([len(images[name]) for name in _CATEGORY_NAMES])
+    image_idx = np.asarray(_preselected_images[current_round - 1]) % image_counts[cells]
+    cell_categories = np.repeat(_CATEGORY_NAMES[cells], 4).tolist()
+    cell_images = np.repeat(image_idx, 4).tolist()
+    
+    for i, (category, idx) in enumerate(zip(cell_categories, cell_images)):
+        image_path = images[category][idx]
+        
+        if image_path.startswith('placeholder_'):
+            # Use colored rectangle
+            rect = _RECT_POOL[i]
+            rect.fillColor = _CATEGORY_COLORS[category]
+            label = _LABEL_POOL[i]
+            if label.text != category[0].upper():
+                label.text = category[0].upper()
             
-            # Fill 2x2 block with this image
-            for block_row in range(2):
-                for block_col in range(2):
-                    row = med_row * 2 + block_row
-                    col = med_col * 2 + block_col
-                    x_pos = start_x + col * grid_spacing
-                    y_pos = start_y - row * grid_spacing
-                    
-                    grid_positions.append((x_pos, y_pos))
-                    
-                    # Create stimulus
-                    if images[category][selected_image_idx].startswith('placeholder_'):
-                        # Use colored rectangle
-                        category_colors = {
-                            'face': 'orange',
-                            'limb': 'green', 
-                            'house': 'purple',
-                            'car': 'yellow'
-                        }
-                        stimulus = visual.Rect(win=win, width=cell_size, height=cell_size,
-                                             fillColor=category_colors[category], 
-                                             lineColor='white', lineWidth=2,
-                                             pos=[x_pos, y_pos])
-                        
-                        text_stim = visual.TextStim(win, text=category[0].upper(), pos=[x_pos, y_pos],
-                                                  color='black', height=24, bold=True)
-                        
-                        grid_stimuli.append({'rect': stimulus, 'text': text_stim, 'category': category, 'image_type': 'rect'})
-                    else:
-                        # Use actual image
-                        img_stim = visual.ImageStim(win, image=images[category][selected_image_idx],
-                                                  pos=[x_pos, y_pos], size=(cell_size, cell_size))
-                        
-                        grid_stimuli.append({'image': img_stim, 'category': category, 'image_type': 'image'})
-                    
-                    # Create cover
-                    cover = visual.Rect(win=win, width=cell_size, height=cell_size,
-                                      fillColor='gray', lineColor='white', lineWidth=2,
-                                      pos=[x_pos, y_pos])
-                    grid_covers.append(cover)
-    
-    # Create special target cover (bright red for recall phase)
-    target_cover = visual.Rect(win=win, width=cell_size, height=cell_size,
-                              fillColor='red', lineColor='white', lineWidth=3,
-                              pos=[0, 0])  # Position will be set during recall phase
-    
-    # Score and timer displays
-    score_text = visual.TextStim(win, text='', pos=[0, scn_height//2 - 30],
-                               color='white', height=20, bold=True)
-    
-    timer_text = visual.TextStim(win, text='', pos=[0, scn_height//2 - 60],
-                               color='yellow', height=24, bold=True)
+            grid_stimuli.append({'rect': rect, 'text': label, 'category': category, 'image_type': 'rect'})
+            grid_rects.append(rect)
+            grid_texts.append(label)
+        else:
+            # Use actual image; only reload when this slot held a different one
+            img_stim = _IMAGE_POOL[i]
+            if _pool_image_paths[i] != image_path:
+                img_stim.image = _load_texture(image_path)
+                _pool_image_paths[i] = image_path
+            
+            grid_stimuli.append({'image': img_stim, 'category': category, 'image_type': 'image'})
+            grid_images.append(img_stim)
     
     print("✓ Game grid created (medium difficulty - 4x4 logical pattern)")
 
@@ -584,18 +809,27 @@ local_gaze_stats = {
 }
 
 def update_local_gaze_display():
-    """Update local gaze marker based on own eye tracking data using corrected formula"""
+    """Send every queued tracker sample to Computer B and move the local marker to the newest"""
     global local_gaze_stats
     
     local_gaze_stats['total_attempts'] += 1
     
-    sample = None
-    try:
-        sample = el_tracker.getNewestSample()
-    except Exception as e:
-        pass
-    
-    if sample is not None:
+    # The tracker delivers samples at 1000 Hz; drain the link queue rather
+    # than keeping only the newest, so B receives all of them
+    newest_gaze = None
+    while True:
+        try:
+            data_type = el_tracker.getNextData()
+            if not data_type:
+                break
+            if data_type != pylink.SAMPLE_TYPE:
+                continue  # link events are not used here
+            sample = el_tracker.getFloatData()
+        except Exception as e:
+            break
+        
+        if sample is None:
+            continue
         local_gaze_stats['samples_received'] += 1
         
         gaze_data = None
@@ -615,39 +849,41 @@ def update_local_gaze_display():
         if gaze_data and gaze_data[0] != pylink.MISSING_DATA and gaze_data[1] != pylink.MISSING_DATA:
             local_gaze_stats['valid_gaze_data'] += 1
             local_gaze_stats['last_valid_gaze'] = gaze_data
-            
-            try:
-                # Use the corrected formula provided
-                gaze_x = (1.2* gaze_data[0] - scn_width/2 + 400-60)
-                gaze_y = (scn_height/2 - 1.2* gaze_data[1] + 200-25)
-
-                
-                if True: # abs(gaze_x) <= scn_width/2 and abs(gaze_y) <= scn_height/2:
-                    local_gaze_marker.setPos([gaze_x, gaze_y])
-                    send_gaze_data(gaze_data[0], gaze_data[1], True)
-                    
-            except Exception as e:
-                pass
+            newest_gaze = gaze_data
+            send_gaze_data(gaze_data[0], gaze_data[1], True)
         else:
             local_gaze_stats['missing_data'] += 1
             send_gaze_data(0, 0, False)
+    
+    if newest_gaze is not None:
+        try:
+            # Use the corrected formula provided
+            gaze_x = _LOCAL_AX * newest_gaze[0] + _LOCAL_BX
+            gaze_y = _LOCAL_AY * newest_gaze[1] + _LOCAL_BY
+            
+            if True: # abs(gaze_x) <= scn_width/2 and abs(gaze_y) <= scn_height/2:
+                _marker_xy[0] = gaze_x
+                _marker_xy[1] = gaze_y
+                
+        except Exception as e:
+            pass
 
 def update_remote_gaze_display():
     """Update remote gaze marker based on received data from Computer B (only in two-player mode)"""
-    global remote_gaze_data
-    
     if single_player_mode:
         return
     
-    if remote_gaze_data.get('valid', False):
-        if True: # time.time() - remote_gaze_data.get('timestamp', 0) < 0.1:
+    x, y, timestamp, valid = remote_gaze
+    if valid:
+        if True: # time.monotonic_ns() - timestamp < 100_000_000:
             try:
-                # Use the same corrected formula for consistency
-                gaze_x = - ( remote_gaze_data['x'] - scn_width/2 + 50)
-                gaze_y = - (scn_height/2 - remote_gaze_data['y'] + 200 )
+                # Mirrored mapping for Computer B's gaze
+                gaze_x = _REMOTE_AX * x + _REMOTE_BX
+                gaze_y = _REMOTE_AY * y + _REMOTE_BY
                 
                 if True: # abs(gaze_x) <= scn_width/2 and abs(gaze_y) <= scn_height/2:
-                    remote_gaze_marker.setPos([gaze_x, gaze_y])
+                    _marker_xy[2] = gaze_x
+                    _marker_xy[3] = gaze_y
                     
             except Exception as e:
                 pass
@@ -657,8 +893,9 @@ def generate_round_parameters():
     global current_round, game_sync_data
     
     current_round += 1
-    target_position = random.randint(0, 63)  # 0-63 for 8x8 grid
-    condition = random.choice(conditions['medium'])
+    b_response_event.clear()
+    target_position = _preselected_targets[current_round - 1]  # 0-63 for 8x8 grid
+    condition = conditions['medium'][_preselected_conditions[current_round - 1]]
     
     game_sync_data.update({
         'round': current_round,
@@ -691,62 +928,82 @@ def run_competitive_round():
     mode_str = "SINGLE" if single_player_mode else "MULTI"
     el_tracker.sendMessage(f"ROUND_{current_round}_START_TARGET_{target_position}_CATEGORY_{target_category}_MEDIUM_{mode_str}")
     
+    # Local aliases for the calls made every frame below (micro-optimization for the render loops)
+    get_time = core.getTime
+    clear = win.clearBuffer
+    flip = win.flip
+    get_keys = kb.getKeys
+    
+    last_score_str = None
+    last_timer_str = None
+    
     # Study phase (5 seconds)
     game_state = 'study'
-    study_start = core.getTime()
+    study_start = get_time()
     
-    while core.getTime() - study_start < 5.0:
+    while True:
+        # One clock read per frame, shared by the loop test and the timer
+        elapsed = get_time() - study_start
+        if elapsed >= 5.0:
+            break
+        
         update_local_gaze_display()
         if not single_player_mode:
             update_remote_gaze_display()
         
-        win.clearBuffer()
+        clear()
         
         # Draw game grid
-        for stim in grid_stimuli:
-            if stim['image_type'] == 'rect':
-                stim['rect'].draw()
-                stim['text'].draw()
-            else:
-                stim['image'].draw()
+        for stim in grid_images:
+            stim.draw()
+        for stim in grid_rects:
+            stim.draw()
+        for stim in grid_texts:
+            stim.draw()
         
         # Draw gaze markers
-        local_gaze_marker.draw()
-        if not single_player_mode and remote_gaze_data.get('valid', False):
-            remote_gaze_marker.draw()
+        draw_gaze_markers(not single_player_mode and remote_gaze[3])
         
         # Draw timer
-        time_left = 5.0 - (core.getTime() - study_start)
-        timer_text.setText(f"Study Time: {time_left:.1f}s")
+        time_left = 5.0 - elapsed
+        timer_str = f"Study Time: {time_left:.1f}s"
+        if timer_str != last_timer_str:  # changes only every 0.1s
+            timer_text.setText(timer_str)
+            last_timer_str = timer_str
         timer_text.draw()
         
-        # Draw score
+        # Draw score (setText only when the string changes)
         if single_player_mode:
-            score_text.setText(f"Round {current_round}/{total_rounds} | Your Score: {player_scores['A']}")
+            score_str = f"Round {current_round}/{total_rounds} | Your Score: {player_scores['A']}"
         else:
-            score_text.setText(f"Round {current_round}/{total_rounds} | Team Score: {player_scores['A']}")
+            score_str = f"Round {current_round}/{total_rounds} | Team Score: {player_scores['A']}"
+        if score_str != last_score_str:
+            score_text.setText(score_str)
+            last_score_str = score_str
         score_text.draw()
         
-        win.flip()
-        core.wait(0.016)
+        _flush_gaze()
+        flip()  # waits for vblank, so the loop runs once per refresh
         
         # Check for escape
-        keys = event.getKeys()
-        if 'escape' in keys:
+        if get_keys(['escape'], waitRelease=False):
             return None
     
     el_tracker.sendMessage(f"ROUND_{current_round}_STUDY_END")
     
     # Recall phase (no time limit - wait for responses)
     game_state = 'recall'
-    target_pos = grid_positions[target_position]
-    target_cover.setPos([target_pos[0], target_pos[1]])  # Position the red target cover
+    target_cover.setPos(grid_positions[target_position])  # Position the red target cover
+    # Covers around the target, split out once for both the recall and feedback loops
+    non_target_covers = tuple(grid_covers[:target_position]) + tuple(grid_covers[target_position + 1:])
     
     el_tracker.sendMessage(f"ROUND_{current_round}_RECALL_START")
     
     response = None
     response_time = None
-    recall_start = core.getTime()
+    # Response times come from the keyboard clock, timed from the start of recall
+    kb.clock.reset()
+    kb.clearEvents()
     
     # No time limit - wait for user response
     while response is None:
@@ -754,52 +1011,41 @@ def run_competitive_round():
         if not single_player_mode:
             update_remote_gaze_display()
         
-        win.clearBuffer()
+        clear()
         
         # Draw covered grid with red target square
-        for i, cover in enumerate(grid_covers):
-            if i != target_position:
-                cover.draw()
+        for cover in non_target_covers:
+            cover.draw()
         
         # Draw bright red square for target position
         target_cover.draw()
         
         # Draw gaze markers
-        local_gaze_marker.draw()
-        if not single_player_mode and remote_gaze_data.get('valid', False):
-            remote_gaze_marker.draw()
+        draw_gaze_markers(not single_player_mode and remote_gaze[3])
         
         # Draw instructions
-        instruction_text = visual.TextStim(win, text='H=House  C=Car  F=Face  L=Limb', 
-                                         pos=[0, -scn_height//2 + 30], color='white', height=16)
         instruction_text.draw()
         
-        # Draw score
+        # Draw score (setText only when the string changes)
         if single_player_mode:
-            score_text.setText(f"Round {current_round}/{total_rounds} | Your Score: {player_scores['A']}")
+            score_str = f"Round {current_round}/{total_rounds} | Your Score: {player_scores['A']}"
         else:
-            score_text.setText(f"Round {current_round}/{total_rounds} | Team Score: {player_scores['A']}")
+            score_str = f"Round {current_round}/{total_rounds} | Team Score: {player_scores['A']}"
+        if score_str != last_score_str:
+            score_text.setText(score_str)
+            last_score_str = score_str
         score_text.draw()
         
-        win.flip()
-        core.wait(0.016)
+        _flush_gaze()
+        flip()  # waits for vblank, so the loop runs once per refresh
         
         # Check for response
-        keys = event.getKeys()
-        if 'h' in keys:
-            response = 'house'
-            response_time = core.getTime() - recall_start
-        elif 'c' in keys:
-            response = 'car'
-            response_time = core.getTime() - recall_start
-        elif 'f' in keys:
-            response = 'face'
-            response_time = core.getTime() - recall_start
-        elif 'l' in keys:
-            response = 'limb'
-            response_time = core.getTime() - recall_start
-        elif 'escape' in keys:
-            return None
+        for key in get_keys(RECALL_KEYS, waitRelease=False):
+            if key.name == 'escape':
+                return None
+            response = RESPONSE_KEY_MAP[key.name]
+            response_time = key.rt
+            break
     
     # Record our response
     if response:
@@ -822,26 +1068,30 @@ def run_competitive_round():
             'difficulty': 'medium',
             'condition': condition,
             'a_response': game_sync_data['responses']['A'],
-            'winner': None,
+            'winner': WIN_NONE,
             'points_awarded': 0,
             'mode': 'single_player'
         }
         
         if response == target_category:
             player_scores['A'] += 1
-            round_result['winner'] = 'Player A'
+            round_result['winner'] = WIN_A_OK
             round_result['points_awarded'] = 1
         else:
-            round_result['winner'] = 'None (incorrect)'
+            round_result['winner'] = WIN_A_FAIL
             round_result['points_awarded'] = 0
     
     else:
-        # Two-player mode - wait for both responses or timeout
-        wait_start = time.time()
-        while time.time() - wait_start < 3.0:  # Wait up to 3 seconds for other player
-            if 'B' in game_sync_data['responses']:
+        # Two-player mode - wait up to 3 seconds for the other player (returns at
+        # once if B already answered), still draining and sending gaze meanwhile
+        wait_deadline = time.monotonic() + 3.0
+        while not b_response_event.is_set():
+            remaining = wait_deadline - time.monotonic()
+            if remaining <= 0:
                 break
-            time.sleep(0.01)
+            b_response_event.wait(min(remaining, 0.05))
+            update_local_gaze_display()
+            _flush_gaze()
         
         # Determine winner and scoring - Collaborative logic
         a_response = game_sync_data['responses'].get('A')
@@ -855,107 +1105,98 @@ def run_competitive_round():
             'condition': condition,
             'a_response': a_response,
             'b_response': b_response,
-            'winner': None,
+            'winner': WIN_NONE,
             'points_awarded': 0,
             'mode': 'two_player'
         }
         
         # Collaborative scoring: first player to respond determines the outcome for BOTH players
-        first_player = None
-        first_response = None
-        
-        if a_response and b_response:
-            # Both players responded - check who answered first
-            if a_response['time'] < b_response['time']:
-                first_player = 'A'
-                first_response = a_response['answer']
-            else:
-                first_player = 'B'
-                first_response = b_response['answer']
-        elif a_response and not b_response:
-            # Only A responded
-            first_player = 'A'
-            first_response = a_response['answer']
-        elif b_response and not a_response:
-            # Only B responded
-            first_player = 'B'
-            first_response = b_response['answer']
+        a_present = a_response is not None
+        b_present = b_response is not None
+        a_faster = a_present and b_present and a_response['time'] < b_response['time']
+        first_player = _FIRST_PLAYER[(a_present, b_present, a_faster)]
+        first_response = (a_response if first_player == 'A' else b_response)['answer'] if first_player else None
         
         # Check if the first responder was correct
         if first_response == target_category:
             # First responder was correct - both players get +1 point
             player_scores['A'] += 1
             player_scores['B'] += 1
-            round_result['winner'] = f'Team (Player {first_player} first)'
+            round_result['winner'] = _WIN_OK[first_player]
             round_result['points_awarded'] = 1
         else:
             # First responder was incorrect - both players get 0 points
-            round_result['winner'] = f'Team failed (Player {first_player} first, wrong answer)'
+            round_result['winner'] = _WIN_FAIL.get(first_player, WIN_NONE)
             round_result['points_awarded'] = 0
     
     trial_results.append(round_result)
+    write_result_row(round_result)
     
     # Show feedback (3 seconds)
     game_state = 'feedback'
-    feedback_start = core.getTime()
     
-    while core.getTime() - feedback_start < 3.0:
+    # Feedback message and score are fixed for the round, so set them up once
+    if single_player_mode:
+        if round_result['points_awarded'] > 0:
+            feedback_msg = f"Correct! +1 point"
+            feedback_color = 'green'
+        else:
+            feedback_msg = f"Wrong answer. Correct: {target_category}"
+            feedback_color = 'red'
+    else:
+        if round_result['points_awarded'] > 0:
+            feedback_msg = f"{_WIN_STR[round_result['winner']]} - Correct! +1 point for both players"
+            feedback_color = 'green'
+        else:
+            feedback_msg = f"{_WIN_STR[round_result['winner']]} - No points this round"
+            feedback_color = 'red'
+    
+    feedback_text = feedback_stims[feedback_color]
+    feedback_text.setText(feedback_msg)
+    
+    if single_player_mode:
+        score_str = f"Round {current_round}/{total_rounds} | Your Score: {player_scores['A']}"
+    else:
+        score_str = f"Round {current_round}/{total_rounds} | Team Score: {player_scores['A']}"
+    if score_str != last_score_str:
+        score_text.setText(score_str)
+    
+    # Resolve the revealed target once, not per frame
+    target_stim = grid_stimuli[target_position]
+    if target_stim['image_type'] == 'rect':
+        target_draws = (target_stim['rect'].draw, target_stim['text'].draw)
+    else:
+        target_draws = (target_stim['image'].draw,)
+    
+    for _ in range(FEEDBACK_FRAMES):
         update_local_gaze_display()
         if not single_player_mode:
             update_remote_gaze_display()
         
-        win.clearBuffer()
+        clear()
         
         # Show correct answer
-        if grid_stimuli[target_position]['image_type'] == 'rect':
-            grid_stimuli[target_position]['rect'].draw()
-            grid_stimuli[target_position]['text'].draw()
-        else:
-            grid_stimuli[target_position]['image'].draw()
+        for draw in target_draws:
+            draw()
         
         # Draw other covers
-        for i, cover in enumerate(grid_covers):
-            if i != target_position:
-                cover.draw()
+        for cover in non_target_covers:
+            cover.draw()
         
         # Draw gaze markers
-        local_gaze_marker.draw()
-        if not single_player_mode and remote_gaze_data.get('valid', False):
-            remote_gaze_marker.draw()
+        draw_gaze_markers(not single_player_mode and remote_gaze[3])
         
         # Draw feedback
-        if single_player_mode:
-            if round_result['points_awarded'] > 0:
-                feedback_msg = f"Correct! +1 point"
-                feedback_color = 'green'
-            else:
-                feedback_msg = f"Wrong answer. Correct: {target_category}"
-                feedback_color = 'red'
-        else:
-            if round_result['points_awarded'] > 0:
-                feedback_msg = f"{round_result['winner']} - Correct! +1 point for both players"
-                feedback_color = 'green'
-            else:
-                feedback_msg = f"{round_result['winner']} - No points this round"
-                feedback_color = 'red'
-        
-        feedback_text = visual.TextStim(win, text=feedback_msg, pos=[0, -scn_height//2 + 60],
-                                      color=feedback_color, height=20, bold=True)
         feedback_text.draw()
         
         # Draw score
-        if single_player_mode:
-            score_text.setText(f"Round {current_round}/{total_rounds} | Your Score: {player_scores['A']}")
-        else:
-            score_text.setText(f"Round {current_round}/{total_rounds} | Team Score: {player_scores['A']}")
         score_text.draw()
         
-        win.flip()
-        core.wait(0.016)
+        _flush_gaze()
+        flip()  # waits for vblank, so the loop runs once per refresh
         
         # Check for escape
-        keys = event.getKeys()
-        if 'escape' in keys:
+        if get_keys(['escape'], waitRelease=False):
             return None
     
     el_tracker.sendMessage(f"ROUND_{current_round}_END")
@@ -965,6 +1206,20 @@ def run_competitive_round():
     
     return round_result
 
+def write_result_row(result):
+    """Append one round to the results file and flush it, so a crash loses at most the current round"""
+    a_response = result['a_response']
+    b_response = result.get('b_response')
+    a_resp, a_time = (a_response['answer'], a_response['time']) if a_response else ('None', 'None')
+    b_resp, b_time = (b_response['answer'], b_response['time']) if b_response else ('None', 'None')
+    
+    # Fields a mode's template doesn't use are ignored by str.format
+    results_fh.write(RESULTS_ROW_FMT.format(
+        a_resp=a_resp, a_time=a_time, b_resp=b_resp, b_time=b_time,
+        correct='Yes' if result['points_awarded'] > 0 else 'No',
+        winner_str=_WIN_STR[result['winner']], **result))
+    results_fh.flush()
+
 def clear_screen(win):
     win.clearBuffer()
     win.flip()
@@ -973,21 +1228,14 @@ def show_msg(win, text, wait_for_keypress=True):
     msg = visual.TextStim(win, text, color='white', wrapWidth=scn_width*0.8, 
                          height=24, bold=True)
     
-    clear_screen(win)
+    # The message is static, so draw it once and block until a key arrives
+    msg.draw()
+    win.flip()
     
     if wait_for_keypress:
-        while True:
-            win.clearBuffer()
-            msg.draw()
-            win.flip()
-            core.wait(0.016)
-            
-            keys = event.getKeys()
-            if keys:
-                break
-    else:
-        msg.draw()
-        win.flip()
+        # Round loops only consume the keys they watch, so drop anything left over
+        kb.clearEvents()
+        kb.waitKeys(waitRelease=False)
     
     clear_screen(win)
 
@@ -996,45 +1244,21 @@ def terminate_task():
     
     print("\nCleaning up...")
     
-    # Save game results
+    # Game results were written as each round finished
+    results_fh.close()
     if trial_results:
-        results_file = os.path.join(session_folder, f"{session_identifier}_competitive_results.txt")
-        with open(results_file, 'w') as f:
-            if single_player_mode:
-                f.write("Round\tDifficulty\tPosition\tTarget\tA_Response\tA_Time\tCorrect\tPoints\tMode\n")
-                for result in trial_results:
-                    a_resp = result['a_response']['answer'] if result['a_response'] else 'None'
-                    a_time = result['a_response']['time'] if result['a_response'] else 'None'
-                    correct = 'Yes' if result['points_awarded'] > 0 else 'No'
-                    
-                    f.write(f"{result['round']}\t{result['difficulty']}\t{result['target_position']}\t{result['target_category']}\t"
-                           f"{a_resp}\t{a_time}\t{correct}\t{result['points_awarded']}\t{result['mode']}\n")
-            else:
-                f.write("Round\tDifficulty\tPosition\tTarget\tA_Response\tA_Time\tB_Response\tB_Time\tWinner\tPoints\tMode\n")
-                for result in trial_results:
-                    a_resp = result['a_response']['answer'] if result['a_response'] else 'None'
-                    a_time = result['a_response']['time'] if result['a_response'] else 'None'
-                    b_resp = result['b_response']['answer'] if result['b_response'] else 'None'
-                    b_time = result['b_response']['time'] if result['b_response'] else 'None'
-                    
-                    f.write(f"{result['round']}\t{result['difficulty']}\t{result['target_position']}\t{result['target_category']}\t"
-                           f"{a_resp}\t{a_time}\t{b_resp}\t{b_time}\t{result['winner']}\t{result['points_awarded']}\t{result['mode']}\n")
-        
         if single_player_mode:
             print(f"✓ Game results saved: Your Score={player_scores['A']}")
         else:
             print(f"✓ Game results saved: Team Score={player_scores['A']} (both players have same score)")
     
-    # Close network sockets (only if they exist)
+    # Close network sockets (only those that were opened)
     try:
+        _cleanup.close()
         if not single_player_mode:
-            send_socket.close()
-            receive_socket.close()
-            game_send_socket.close()
-            game_receive_socket.close()
             print("✓ Network sockets closed")
-    except:
-        pass
+    except Exception as e:
+        print(f"Socket close error: {e}")
     
     if el_tracker and el_tracker.isConnected():
         try:
@@ -1046,10 +1270,9 @@ def terminate_task():
             el_tracker.closeDataFile()
             
             # Download EDF file
-            local_edf = os.path.join(session_folder, session_identifier + '.EDF')
             try:
-                el_tracker.receiveDataFile(edf_file, local_edf)
-                print(f"✓ Data file saved: {local_edf}")
+                el_tracker.receiveDataFile(edf_file, LOCAL_EDF_PATH)
+                print(f"✓ Data file saved: {LOCAL_EDF_PATH}")
             except RuntimeError as error:
                 print('Data file download error:', error)
             
@@ -1073,45 +1296,58 @@ def terminate_task():
 
 # Show instructions
 if single_player_mode:
-    task_msg = 'Computer A - Simplified Single Player Memory Game\n\n'
-    task_msg += 'SINGLE PLAYER MODE (Computer B not detected)\n\n'
-    task_msg += 'Single Player Rules:\n'
-    task_msg += '• Study grid for 5 seconds\n'
-    task_msg += '• Recall what was at marked position\n'
-    task_msg += '• Press H=House, C=Car, F=Face, L=Limb\n'
-    task_msg += '• NO TIME LIMIT for responses\n'
-    task_msg += '• Correct answer: +1 point\n'
-    task_msg += '• Wrong answer: 0 points\n'
-    task_msg += '• MEDIUM DIFFICULTY ONLY: 4x4 logical patterns\n'
-    task_msg += f'• {total_rounds} rounds total\n\n'
+    rules = [
+        'Computer A - Simplified Single Player Memory Game',
+        '',
+        'SINGLE PLAYER MODE (Computer B not detected)',
+        '',
+        'Single Player Rules:',
+        '• Study grid for 5 seconds',
+        '• Recall what was at marked position',
+        '• Press H=House, C=Car, F=Face, L=Limb',
+        '• NO TIME LIMIT for responses',
+        '• Correct answer: +1 point',
+        '• Wrong answer: 0 points',
+        '• MEDIUM DIFFICULTY ONLY: 4x4 logical patterns',
+        f'• {total_rounds} rounds total',
+        ''
+    ]
 else:
-    task_msg = 'Computer A - Simplified Collaborative Memory Game\n\n'
-    task_msg += 'Two-Player Collaborative Rules:\n'
-    task_msg += '• Study grid for 5 seconds\n'
-    task_msg += '• Recall what was at marked position\n'
-    task_msg += '• Press H=House, C=Car, F=Face, L=Limb\n'
-    task_msg += '• NO TIME LIMIT for responses\n'
-    task_msg += '• First player to respond determines team outcome:\n'
-    task_msg += '  - If first responder is CORRECT: +1 point for BOTH players\n'
-    task_msg += '  - If first responder is WRONG: 0 points for BOTH players\n'
-    task_msg += '• Second player response is ignored\n'
-    task_msg += '• MEDIUM DIFFICULTY ONLY: 4x4 logical patterns\n'
-    task_msg += f'• {total_rounds} rounds total\n\n'
-    task_msg += 'Network Configuration:\n'
-    task_msg += f'• Local IP: {LOCAL_IP}\n'
-    task_msg += f'• Remote IP: {REMOTE_IP}\n\n'
-
-task_msg += 'Controls:\n'
-task_msg += '• SPACE = Recalibrate eye tracker\n'
-task_msg += '• ESCAPE = Exit program\n\n'
-task_msg += 'SIMPLIFIED VERSION:\n'
-task_msg += '• Single calibration (no validation)\n'
-task_msg += '• Medium difficulty only\n'
-task_msg += '• PNG image support\n'
-task_msg += '• Correct plural folder names (limbs, not limb)\n\n'
-if dummy_mode:
-    task_msg += 'DUMMY MODE: Simulated eye tracking\n'
-task_msg += 'Press any key to begin calibration'
+    rules = [
+        'Computer A - Simplified Collaborative Memory Game',
+        '',
+        'Two-Player Collaborative Rules:',
+        '• Study grid for 5 seconds',
+        '• Recall what was at marked position',
+        '• Press H=House, C=Car, F=Face, L=Limb',
+        '• NO TIME LIMIT for responses',
+        '• First player to respond determines team outcome:',
+        '  - If first responder is CORRECT: +1 point for BOTH players',
+        '  - If first responder is WRONG: 0 points for BOTH players',
+        '• Second player response is ignored',
+        '• MEDIUM DIFFICULTY ONLY: 4x4 logical patterns',
+        f'• {total_rounds} rounds total',
+        '',
+        'Network Configuration:',
+        f'• Local IP: {LOCAL_IP}',
+        f'• Remote IP: {REMOTE_IP}',
+        ''
+    ]
+
+task_msg = '\n'.join(rules + [
+    'Controls:',
+    '• SPACE = Recalibrate eye tracker',
+    '• ESCAPE = Exit program',
+    '',
+    'SIMPLIFIED VERSION:',
+    '• Single calibration (no validation)',
+    '• Medium difficulty only',
+    '• PNG image support',
+    '• Correct plural folder names (limbs, not limb)',
+    ''
+] + (['DUMMY MODE: Simulated eye tracking'] if dummy_mode else []) + [
+    'Press any key to begin calibration'
+])
 
 show_msg(win, task_msg)
 
@@ -1131,6 +1367,7 @@ if not dummy_mode:
         win.winHandle.activate()
         win.flip()
         event.clearEvents()
+        kb.clearEvents()
         
     except RuntimeError as err:
         print('Calibration ERROR:', err)
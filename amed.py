@@ -11,14 +11,20 @@ INITIATES ROUNDS: Computer A starts each round and sends parameters to B
 import pylink
 import os
 import platform
-import random
 import time
 import sys
 import numpy as np
 import socket
+import selectors
 import threading
+import queue
 import json
+import struct
+import ctypes
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from psychopy import visual, core, event, monitors, gui
+from psychopy.hardware import keyboard
 from EyeLinkCoreGraphicsPsychoPy import EyeLinkCoreGraphicsPsychoPy
 from PIL import Image
 from string import ascii_letters, digits
@@ -30,18 +36,57 @@ GAZE_PORT = 8888
 SEND_PORT = 8889
 GAME_PORT = 8890  # Port for sending game synchronization to B
 
+# Gaze packet wire format, shared with Computer B: timestamp, x, y, valid, sender ('A'/'B')
+GAZE_FMT = struct.Struct('<dff?c')
+SOCKET_BUFFER_SIZE = 4 * 1024 * 1024  # requested kernel buffer per socket (the kernel may cap it)
+
+# Clocks: elapsed times use perf_counter; timestamps sent to B are wall-clock seconds,
+# anchored once at startup and advanced by the monotonic clock so NTP steps can't move them
+now = time.perf_counter
+_WALL_EPOCH = time.time() - time.monotonic()
+
+def wall_time():
+    """Wall-clock seconds that never jump during the session"""
+    return _WALL_EPOCH + time.monotonic()
+
+# CPU placement: the network thread gets the last core this process may use,
+# everything else (render loop, tracker link, loader threads) stays on the rest
+if hasattr(os, 'sched_getaffinity'):
+    _ALLOWED_CORES = sorted(os.sched_getaffinity(0))
+else:
+    _ALLOWED_CORES = list(range(os.cpu_count() or 1))
+NET_CORE = _ALLOWED_CORES[-1] if len(_ALLOWED_CORES) > 1 else None
+
+def _pin_current_thread(cores):
+    """Best effort: restrict the calling thread to the given cores (Linux and Windows)"""
+    try:
+        if hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(0, cores)  # pid 0 is the calling thread
+        elif sys.platform == 'win32':
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadAffinityMask(kernel32.GetCurrentThread(),
+                                           ctypes.c_size_t(sum(1 << c for c in cores)))
+    except OSError:
+        pass
+
+# Pin the main (render) thread now, before any other thread is started; Linux threads inherit it
+if NET_CORE is not None:
+    _pin_current_thread(set(_ALLOWED_CORES[:-1]))
+
 # Global variables
 el_tracker = None
 win = None
-remote_gaze_data = {'x': 0, 'y': 0, 'valid': False, 'timestamp': 0}
-network_stats = {'sent': 0, 'received': 0, 'errors': 0}
+remote_gaze = (0.0, 0.0, False, 0.0)  # latest from Computer B: (x, y, valid, timestamp), replaced whole
+# Gaze and network counters, indexed by the S_* constants below
+S_TOTAL, S_SAMPLES, S_VALID, S_MISSING, S_SENT, S_RECV, S_ERR = range(7)
+STATS = np.zeros(7, dtype=np.int64)
 
 # Game variables
 game_state = 'waiting'
 current_round = 0
 total_rounds = 10
+FEEDBACK_DURATION = 3.0  # seconds the answer and feedback stay on screen
 grid_layout = []  # Will store the 8x8 grid layout
-grid_positions = []
 trial_results = []
 game_sync_data = {'round': 0, 'target_pos': 0, 'grid_seed': 0, 'responses': {}}
 player_scores = {'A': 0, 'B': 0}
@@ -67,6 +112,10 @@ CATEGORY_MAP = {
     3: 'car'
 }
 
+# Recall response keys
+KEY_TO_CATEGORY = {'h': 'house', 'c': 'car', 'f': 'face', 'l': 'limb'}
+RECALL_KEYS = list(KEY_TO_CATEGORY) + ['escape']
+
 # Switch to the script folder
 script_path = os.path.dirname(sys.argv[0])
 if len(script_path) != 0:
@@ -131,6 +180,12 @@ session_folder = os.path.join(results_folder, session_identifier)
 if not os.path.exists(session_folder):
     os.makedirs(session_folder)
 
+# Game results file - one row is appended as each round finishes
+results_file = os.path.join(session_folder, f"{session_identifier}_competitive_results.txt")
+results_fh = open(results_file, 'w')
+results_fh.write("Round\tDifficulty\tPosition\tTarget\tA_Response\tA_Time\tB_Response\tB_Time\tWinner\tPoints\tMode\n")
+results_fh.flush()
+
 # Load conditions from JSON file
 def load_conditions():
     """Load conditions from dyad_conditions.json"""
@@ -154,6 +209,17 @@ def load_conditions():
             'medium': [[2, 0, 1, 3, 2, 3, 0, 1, 3, 1, 2, 1, 0, 2, 0, 3]]
         }
 
+# Decodes stimuli in the background while the tracker and window are set up
+_texture_loader = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+_texture_futures = {}  # image path -> pending decode
+
+@functools.lru_cache(maxsize=64)
+def _load_texture(path):
+    """Decode an image once into a PsychoPy-ready array"""
+    # Rows are flipped because PsychoPy draws array row 0 at the bottom
+    pixels = Image.open(path).convert('RGB')
+    return np.flipud(np.asarray(pixels, dtype=np.float32)) / 127.5 - 1.0
+
 def load_all_images():
     """Load all images from stimuli folder - FIXED: PNG support and correct plurals"""
     global images
@@ -180,7 +246,8 @@ def load_all_images():
                 
                 if os.path.exists(image_path):
                     try:
-                        # Don't create ImageStim here, just store the path
+                        # Decode in the background so rounds only swap in the cached array
+                        _texture_futures[image_path] = _texture_loader.submit(_load_texture, image_path)
                         images[category_key].append(image_path)
                         if i == 0:  # Only print for first image of each category
                             print(f"✓ Found {folder_name} images")
@@ -200,6 +267,14 @@ def load_all_images():
 load_conditions()
 load_all_images()
 
+# Draw the whole session's randomness up front from one seeded generator (seed is printed for replay)
+session_seed = np.random.SeedSequence().entropy
+_rng = np.random.default_rng(session_seed)
+_plan_conditions = _rng.integers(0, len(conditions['medium']), size=total_rounds).tolist()
+_plan_targets = _rng.integers(0, 64, size=total_rounds).tolist()  # 8x8 grid has 64 positions
+_plan_images = _rng.integers(0, 2**31, size=(total_rounds, 16)).tolist()  # reduced per category when used
+print(f"✓ Session randomness drawn (seed {session_seed})")
+
 # Connect to EyeLink
 print("\n1. CONNECTING TO EYELINK")
 print("-" * 30)
@@ -264,7 +339,11 @@ print(f"✓ Tracker configured for competitive game recording")
 print("\n3. SETTING UP DISPLAY")
 print("-" * 25)
 mon = monitors.Monitor('myMonitor', width=53.0, distance=70.0)
-win = visual.Window(fullscr=full_screen, monitor=mon, winType='pyglet', units='pix', color=[0, 0, 0])
+win = visual.Window(fullscr=full_screen, monitor=mon, winType='pyglet', units='pix', color=[0, 0, 0],
+                    waitBlanking=True)
+
+# Keyboard device for all key polling (uses the Psychtoolbox backend when available)
+kb = keyboard.Keyboard()
 
 scn_width, scn_height = win.size
 print(f"✓ Window: {scn_width} x {scn_height}")
@@ -299,101 +378,131 @@ print("✓ Graphics environment ready")
 print("\n4. CREATING VISUAL ELEMENTS")
 print("-" * 30)
 
+# Collect the background decodes; images that failed fall back to placeholders like missing folders
+for category_key, paths in images.items():
+    for path in list(paths):
+        future = _texture_futures.get(path)
+        if future is not None and future.exception() is not None:
+            print(f"Error loading {path}: {future.exception()}")
+            paths.remove(path)
+    if not paths:
+        paths.extend(f"placeholder_{category_key}_{i}" for i in range(10))
+_texture_loader.shutdown(wait=True)
+print("✓ Stimulus images decoded")
+
 # Gaze markers (smaller, less prominent) - Different colors for Computer A
 local_gaze_marker = visual.Circle(win=win, radius=8, fillColor='red', lineColor='white', lineWidth=1)
 remote_gaze_marker = visual.Circle(win=win, radius=8, fillColor='cyan', lineColor='white', lineWidth=1)
 
+# Feedback text, built once and updated in place
+feedback_text = visual.TextStim(win, text='', pos=[0, -scn_height//2 + 60],
+                              color='white', height=20, bold=True)
+
+# Recall instructions, score and timer displays, built once and updated in place
+instruction_text = visual.TextStim(win, text='H=House  C=Car  F=Face  L=Limb', 
+                                 pos=[0, -scn_height//2 + 30], color='white', height=16)
+score_text = visual.TextStim(win, text='', pos=[0, scn_height//2 - 30],
+                           color='white', height=20, bold=True)
+timer_text = visual.TextStim(win, text='', pos=[0, scn_height//2 - 60],
+                           color='yellow', height=24, bold=True)
+
+# Grid geometry - 8x8 physical grid representing a 4x4 logical pattern, fixed for the session
+GRID_SIZE = 8
+
+# Calculate available space (leave room for UI elements)
+available_width = scn_width * 0.9  # Use 90% of screen width
+available_height = (scn_height - 120) * 0.9  # Leave 120px for UI at top/bottom
+
+# Calculate cell size based on available space
+cell_size = min(available_width / GRID_SIZE, available_height / GRID_SIZE) * 0.95  # 95% to leave small gaps
+
+# Calculate starting position to center the grid
+start_x = -cell_size * GRID_SIZE / 2 + cell_size / 2
+start_y = cell_size * GRID_SIZE / 2 - cell_size / 2
+
+# Cell centres as a (64, 2) array in block order: each 2x2 block of a logical cell is contiguous,
+# so slot i belongs to logical cell i // 4
+_med_row, _med_col, _blk_row, _blk_col = np.indices((4, 4, 2, 2)).reshape(4, -1)
+grid_positions = np.stack([start_x + (_med_col * 2 + _blk_col) * cell_size,
+                           start_y - (_med_row * 2 + _blk_row) * cell_size], axis=-1).astype(np.float32)
+
+# Special target cover (bright red for recall phase)
+target_cover = visual.Rect(win=win, width=cell_size, height=cell_size,
+                          fillColor='red', lineColor='white', lineWidth=3,
+                          pos=[0, 0])  # Position will be set during recall phase
+
+# Grid stimuli reused across rounds, one slot per cell, placed once at their cell centre
+_IMAGE_POOL = [visual.ImageStim(win, image=None, pos=pos, size=(cell_size*0.9, cell_size*0.9))
+               for pos in grid_positions]
+_RECT_POOL = [visual.Rect(win=win, width=cell_size, height=cell_size,
+                          fillColor='gray', lineColor='white', lineWidth=2, pos=pos)
+              for pos in grid_positions]
+_LABEL_POOL = [visual.TextStim(win, text='', pos=pos, color='black', height=int(cell_size*0.3), bold=True)
+               for pos in grid_positions]
+_pool_image_paths = [None] * len(_IMAGE_POOL)  # image currently loaded in each slot
+
+# All covers drawn as two instanced arrays (one GL call each): white squares for the
+# outline, with slightly smaller gray squares on top
+_cover_edges = visual.ElementArrayStim(win, units='pix', nElements=len(grid_positions), xys=grid_positions,
+                                       sizes=cell_size + 2, elementTex=None, elementMask=None,
+                                       colors=(1, 1, 1), colorSpace='rgb')
+_cover_fills = visual.ElementArrayStim(win, units='pix', nElements=len(grid_positions), xys=grid_positions,
+                                       sizes=cell_size - 2, elementTex=None, elementMask=None,
+                                       colors=(0, 0, 0), colorSpace='rgb')
+
+def set_uncovered_cell(index):
+    """Hide the cover over one cell (the round's target) and show all the others"""
+    opacities = np.ones(len(grid_positions))
+    opacities[index] = 0
+    _cover_edges.opacities = opacities
+    _cover_fills.opacities = opacities
+
+def draw_covers():
+    """Draw every visible cover"""
+    _cover_edges.draw()
+    _cover_fills.draw()
+
 # Game grid elements - ONLY MEDIUM DIFFICULTY (4x4 logical patterns)
 def create_grid_from_condition(condition):
     """Create grid from condition array using actual images - MEDIUM DIFFICULTY ONLY"""
-    global grid_stimuli, grid_covers, grid_positions, target_cover, score_text, timer_text
-    
-    # Grid setup - 8x8 physical grid representing 4x4 logical pattern
-    physical_grid_size = 8
+    global grid_stimuli
     
-    # Calculate available space (leave room for UI elements)
-    available_width = scn_width * 0.9  # Use 90% of screen width
-    available_height = (scn_height - 120) * 0.9  # Leave 120px for UI at top/bottom
-    
-    # Calculate cell size based on available space
-    max_cell_width = available_width / physical_grid_size
-    max_cell_height = available_height / physical_grid_size
-    cell_size = min(max_cell_width, max_cell_height) * 0.95  # 95% to leave small gaps
-    
-    # Calculate actual grid dimensions
-    total_grid_width = cell_size * physical_grid_size
-    total_grid_height = cell_size * physical_grid_size
-    
-    # Calculate starting position to center the grid
-    start_x = -total_grid_width / 2 + cell_size / 2
-    start_y = total_grid_height / 2 - cell_size / 2
+    category_colors = {
+        'face': 'orange',
+        'limb': 'green', 
+        'house': 'purple',
+        'car': 'yellow'
+    }
     
     grid_stimuli = []
-    grid_covers = []
-    grid_positions.clear()
     
     # Medium difficulty: condition is a 16-element array representing 4x4 pattern
     condition_categories = [CATEGORY_MAP[num] for num in condition]
     
     # Each position in 4x4 becomes a 2x2 block in 8x8
-    for med_row in range(4):
-        for med_col in range(4):
-            category = condition_categories[med_row * 4 + med_col]
-            # Randomly select one image from this category
-            selected_image_idx = random.randint(0, len(images[category]) - 1)
-            
-            # Fill 2x2 block with this image
-            for block_row in range(2):
-                for block_col in range(2):
-                    row = med_row * 2 + block_row
-                    col = med_col * 2 + block_col
-                    x_pos = start_x + col * cell_size
-                    y_pos = start_y - row * cell_size
-                    
-                    grid_positions.append((x_pos, y_pos))
-                    
-                    # Create stimulus
-                    if images[category][selected_image_idx].startswith('placeholder_'):
-                        # Use colored rectangle
-                        category_colors = {
-                            'face': 'orange',
-                            'limb': 'green', 
-                            'house': 'purple',
-                            'car': 'yellow'
-                        }
-                        stimulus = visual.Rect(win=win, width=cell_size, height=cell_size,
-                                             fillColor=category_colors[category], 
-                                             lineColor='white', lineWidth=2,
-                                             pos=[x_pos, y_pos])
-                        
-                        text_stim = visual.TextStim(win, text=category[0].upper(), pos=[x_pos, y_pos],
-                                                  color='black', height=int(cell_size*0.3), bold=True)
-                        
-                        grid_stimuli.append({'rect': stimulus, 'text': text_stim, 'category': category, 'image_type': 'rect'})
-                    else:
-                        # Use actual image
-                        img_stim = visual.ImageStim(win, image=images[category][selected_image_idx],
-                                                  pos=[x_pos, y_pos], size=(cell_size*0.9, cell_size*0.9))
-                        
-                        grid_stimuli.append({'image': img_stim, 'category': category, 'image_type': 'image'})
-                    
-                    # Create cover
-                    cover = visual.Rect(win=win, width=cell_size, height=cell_size,
-                                      fillColor='gray', lineColor='white', lineWidth=2,
-                                      pos=[x_pos, y_pos])
-                    grid_covers.append(cover)
-    
-    # Create special target cover (bright red for recall phase)
-    target_cover = visual.Rect(win=win, width=cell_size, height=cell_size,
-                              fillColor='red', lineColor='white', lineWidth=3,
-                              pos=[0, 0])  # Position will be set during recall phase
-    
-    # Score and timer displays
-    score_text = visual.TextStim(win, text='', pos=[0, scn_height//2 - 30],
-                               color='white', height=20, bold=True)
-    
-    timer_text = visual.TextStim(win, text='', pos=[0, scn_height//2 - 60],
-                               color='yellow', height=24, bold=True)
+    for block, category in enumerate(condition_categories):
+        # Pick this round's preselected image from the category
+        selected_image_idx = _plan_images[current_round - 1][block] % len(images[category])
+        image_path = images[category][selected_image_idx]
+        
+        # Fill 2x2 block with this image
+        for i in range(block * 4, block * 4 + 4):
+            if image_path.startswith('placeholder_'):
+                # Use colored rectangle
+                stimulus = _RECT_POOL[i]
+                stimulus.fillColor = category_colors[category]
+                text_stim = _LABEL_POOL[i]
+                text_stim.text = category[0].upper()
+                
+                grid_stimuli.append({'rect': stimulus, 'text': text_stim, 'category': category, 'image_type': 'rect'})
+            else:
+                # Use actual image; the texture is only re-uploaded when the slot's image changes
+                img_stim = _IMAGE_POOL[i]
+                if _pool_image_paths[i] != image_path:
+                    img_stim.image = _load_texture(image_path)
+                    _pool_image_paths[i] = image_path
+                
+                grid_stimuli.append({'image': img_stim, 'category': category, 'image_type': 'image'})
     
     print("✓ Game grid created (medium difficulty - 4x4 logical pattern)")
 
@@ -406,23 +515,28 @@ def setup_network():
         # Gaze data sockets
         send_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         send_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        send_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
         print(f"✓ Gaze send socket created for {REMOTE_IP}:{SEND_PORT}")
         
         receive_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         receive_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        receive_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
         receive_socket.bind((LOCAL_IP, GAZE_PORT))
-        receive_socket.settimeout(0.001)
-        print(f"✓ Gaze receive socket bound to {LOCAL_IP}:{GAZE_PORT}")
+        receive_socket.setblocking(False)
+        print(f"✓ Gaze receive socket bound to {LOCAL_IP}:{GAZE_PORT} "
+              f"(receive buffer {receive_socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)} bytes)")
         
         # Game synchronization sockets
         game_send_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         game_send_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        game_send_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
         print(f"✓ Game send socket created for {REMOTE_IP}:{GAME_PORT}")
         
         game_receive_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         game_receive_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        game_receive_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
         game_receive_socket.bind((LOCAL_IP, GAME_PORT))
-        game_receive_socket.settimeout(0.001)
+        game_receive_socket.setblocking(False)
         print(f"✓ Game receive socket bound to {LOCAL_IP}:{GAME_PORT}")
         
         return True
@@ -432,23 +546,13 @@ def setup_network():
 
 def send_gaze_data(gaze_x, gaze_y, valid=True):
     """Send gaze data to Computer B"""
-    global network_stats
-    
     try:
-        data = {
-            'x': float(gaze_x),
-            'y': float(gaze_y),
-            'valid': valid,
-            'timestamp': time.time(),
-            'computer': 'A'
-        }
-        
-        message = json.dumps(data).encode('utf-8')
+        message = GAZE_FMT.pack(wall_time(), gaze_x, gaze_y, bool(valid), b'A')
         send_socket.sendto(message, (REMOTE_IP, SEND_PORT))
-        network_stats['sent'] += 1
+        STATS[S_SENT] += 1
         
     except Exception as e:
-        network_stats['errors'] += 1
+        STATS[S_ERR] += 1
 
 def send_game_data(data_type, data):
     """Send game synchronization data to Computer B"""
@@ -456,7 +560,7 @@ def send_game_data(data_type, data):
         message = {
             'type': data_type,
             'data': data,
-            'timestamp': time.time(),
+            'timestamp': wall_time(),
             'from': 'A'
         }
         
@@ -466,73 +570,117 @@ def send_game_data(data_type, data):
     except Exception as e:
         print(f"Game send error: {e}")
 
-def receive_gaze_data():
-    """Continuously receive gaze data from Computer B"""
-    global remote_gaze_data, network_stats
+def drain_socket(sock, max_n=32):
+    """Collect up to max_n datagrams already queued on a non-blocking socket"""
+    packets = []
+    while len(packets) < max_n:
+        try:
+            packets.append(sock.recv(1024))
+        except BlockingIOError:
+            break
+    return packets
+
+# Parsed network updates, filled by the network thread and applied by the main thread
+net_queue = queue.Queue()
+b_response_event = threading.Event()  # set as soon as B's answer for the round is queued
+
+def _prioritise_net_thread():
+    """Best effort: move the calling thread onto NET_CORE and raise its priority"""
+    if NET_CORE is not None:
+        _pin_current_thread({NET_CORE})
     
+    if sys.platform == 'win32':
+        kernel32 = ctypes.windll.kernel32
+        if not kernel32.SetThreadPriority(kernel32.GetCurrentThread(), 2):  # THREAD_PRIORITY_HIGHEST
+            print("⚠️  Network thread priority unchanged")
+        return
+    if not hasattr(os, 'sched_setscheduler'):
+        return  # e.g. macOS: no per-thread scheduling control from Python
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(10))
+    except OSError:
+        try:
+            os.nice(-5)  # per-thread on Linux; needs CAP_SYS_NICE like SCHED_FIFO
+        except OSError:
+            print("⚠️  Network thread priority unchanged (no permission)")
+
+def _net_loop():
+    """Wait on both receive sockets and queue parsed updates for the main thread"""
+    _prioritise_net_thread()
+    sel = selectors.DefaultSelector()
+    sel.register(receive_socket, selectors.EVENT_READ)
+    sel.register(game_receive_socket, selectors.EVENT_READ)
     while True:
         try:
-            data, addr = receive_socket.recvfrom(1024)
-            gaze_info = json.loads(data.decode('utf-8'))
-            
-            if gaze_info.get('computer') == 'B':
-                remote_gaze_data.update(gaze_info)
-                network_stats['received'] += 1
-                
-        except socket.timeout:
-            continue
+            # Block until data arrives: no idle wakeups competing with the render thread for the GIL
+            for key, _ in sel.select():
+                sock = key.fileobj
+                packets = drain_socket(sock)
+                if not packets:
+                    continue
+                if sock is receive_socket:
+                    STATS[S_RECV] += len(packets)
+                    # Only the newest sample matters; older ones in the burst are skipped unparsed
+                    if len(packets[-1]) == GAZE_FMT.size:
+                        sample = GAZE_FMT.unpack_from(packets[-1])
+                        if sample[4] == b'B':  # ignore our own packets looped back
+                            net_queue.put_nowait(('gaze', sample))
+                else:
+                    # Every game message counts, so queue the whole burst in order
+                    for data in packets:
+                        message = json.loads(data.decode('utf-8'))
+                        net_queue.put_nowait(('game', message))
+                        if message.get('from') == 'B' and message.get('type') == 'response':
+                            b_response_event.set()
+                        
         except Exception as e:
-            network_stats['errors'] += 1
+            STATS[S_ERR] += 1
             time.sleep(0.001)
 
-def receive_game_data():
-    """Continuously receive game synchronization data"""
-    global game_sync_data
+def start_net_thread():
+    """Start the background network receiver"""
+    net_thread = threading.Thread(target=_net_loop, daemon=True)
+    net_thread.start()
+    return net_thread
+
+def apply_network_updates():
+    """Apply everything the network thread has queued (main thread only)"""
+    global remote_gaze, game_sync_data
     
     while True:
         try:
-            data, addr = game_receive_socket.recvfrom(1024)
-            message = json.loads(data.decode('utf-8'))
-            
-            if message.get('from') == 'B':
-                if message['type'] == 'response':
-                    game_sync_data['responses']['B'] = message['data']
-                elif message['type'] == 'ready':
-                    game_sync_data['b_ready'] = True
-                    
-        except socket.timeout:
-            continue
-        except Exception as e:
-            time.sleep(0.001)
+            kind, payload = net_queue.get_nowait()
+        except queue.Empty:
+            break
+        
+        if kind == 'gaze':
+            timestamp, x, y, valid, _ = payload
+            remote_gaze = (x, y, valid, timestamp)
+        elif payload.get('from') == 'B':
+            if payload['type'] == 'response':
+                game_sync_data['responses']['B'] = payload['data']
+            elif payload['type'] == 'ready':
+                game_sync_data['b_ready'] = True
 
 # Start network setup
 if not setup_network():
     print("Failed to setup network. Exiting...")
     sys.exit()
 
-# Start receiving threads
-receive_thread = threading.Thread(target=receive_gaze_data, daemon=True)
-receive_thread.start()
-
-game_receive_thread = threading.Thread(target=receive_game_data, daemon=True)
-game_receive_thread.start()
+# Start receiving thread (serves both gaze and game sockets)
+net_thread = start_net_thread()
 
 print("✓ Network communication started")
 
-# Gaze statistics
-local_gaze_stats = {
-    'total_attempts': 0,
-    'samples_received': 0,
-    'valid_gaze_data': 0,
-    'missing_data': 0,
-    'last_valid_gaze': None
-}
+# Most recent valid local gaze sample (counters live in STATS)
+last_valid_gaze = None
+last_sent_sample_time = None  # tracker time of the last sample sent to Computer B
 
 def update_local_gaze_display():
     """Update local gaze marker based on own eye tracking data using corrected formula"""
-    global local_gaze_stats
+    global last_valid_gaze, last_sent_sample_time
     
-    local_gaze_stats['total_attempts'] += 1
+    STATS[S_TOTAL] += 1
     
     sample = None
     try:
@@ -541,7 +689,7 @@ def update_local_gaze_display():
         pass
     
     if sample is not None:
-        local_gaze_stats['samples_received'] += 1
+        STATS[S_SAMPLES] += 1
         
         gaze_data = None
         
@@ -558,8 +706,8 @@ def update_local_gaze_display():
                 pass
         
         if gaze_data and gaze_data[0] != pylink.MISSING_DATA and gaze_data[1] != pylink.MISSING_DATA:
-            local_gaze_stats['valid_gaze_data'] += 1
-            local_gaze_stats['last_valid_gaze'] = gaze_data
+            STATS[S_VALID] += 1
+            last_valid_gaze = gaze_data
             
             try:
                 # Use the corrected formula provided
@@ -568,27 +716,38 @@ def update_local_gaze_display():
                 
                 if True: # abs(gaze_x) <= scn_width/2 and abs(gaze_y) <= scn_height/2:
                     local_gaze_marker.setPos([gaze_x, gaze_y])
-                    send_gaze_data(gaze_data[0], gaze_data[1], True)
+                    # At most one packet per tracker sample: skip frames where the newest sample is unchanged
+                    sample_time = sample.getTime()
+                    if sample_time != last_sent_sample_time:
+                        last_sent_sample_time = sample_time
+                        send_gaze_data(gaze_data[0], gaze_data[1], True)
                     
             except Exception as e:
                 pass
         else:
-            local_gaze_stats['missing_data'] += 1
+            STATS[S_MISSING] += 1
             send_gaze_data(0, 0, False)
 
+# Remote gaze (x, y) the marker was last positioned from
+_remote_marker_src = [None]
+
 def update_remote_gaze_display():
     """Update remote gaze marker based on received data from Computer B"""
-    global remote_gaze_data
-    
-    if remote_gaze_data.get('valid', False):
-        if True: # time.time() - remote_gaze_data.get('timestamp', 0) < 0.1:
+    if remote_gaze[2]:
+        if True: # wall_time() - remote_gaze[3] < 0.1:
             try:
+                # B sends at most once per frame, so most frames have nothing new
+                src = remote_gaze[:2]
+                if src == _remote_marker_src[0]:
+                    return
+                _remote_marker_src[0] = src
+                
                 # Use the same corrected formula for consistency
-                gaze_x = (1.2 * remote_gaze_data['x'] - scn_width/2 + 400 - 60)
-                gaze_y = (scn_height/2 - 1.2 * remote_gaze_data['y'] + 200 - 25)
+                gaze_x = (1.2 * src[0] - scn_width/2 + 400 - 60)
+                gaze_y = (scn_height/2 - 1.2 * src[1] + 200 - 25)
                 
                 if True: # abs(gaze_x) <= scn_width/2 and abs(gaze_y) <= scn_height/2:
-                    remote_gaze_marker.setPos([gaze_x, gaze_y])
+                    remote_gaze_marker.pos = (gaze_x, gaze_y)
                     
             except Exception as e:
                 pass
@@ -597,9 +756,9 @@ def initiate_round_start(round_num):
     """Computer A initiates round by sending parameters to Computer B"""
     global current_round, game_sync_data
     
-    # Select random condition and target position
-    condition = random.choice(conditions['medium'])
-    target_position = random.randint(0, 63)  # 8x8 grid has 64 positions
+    # Take this round's condition and target position from the session plan
+    condition = conditions['medium'][_plan_conditions[round_num - 1]]
+    target_position = _plan_targets[round_num - 1]
     
     round_data = {
         'round': round_num,
@@ -630,16 +789,17 @@ def run_competitive_round(round_num):
     
     el_tracker.sendMessage(f"ROUND_{current_round}_START_TARGET_{target_position}_CATEGORY_{target_category}_MEDIUM_MULTI")
     
+    last_score_str = None  # force one setText at the start of each round
+    
     # Study phase (5 seconds)
     game_state = 'study'
     study_start = core.getTime()
     
     while core.getTime() - study_start < 5.0:
         update_local_gaze_display()
+        apply_network_updates()
         update_remote_gaze_display()
         
-        win.clearBuffer()
-        
         # Draw game grid
         for stim in grid_stimuli:
             if stim['image_type'] == 'rect':
@@ -650,7 +810,7 @@ def run_competitive_round(round_num):
         
         # Draw gaze markers
         local_gaze_marker.draw()
-        if remote_gaze_data.get('valid', False):
+        if remote_gaze[2]:
             remote_gaze_marker.draw()
         
         # Draw timer
@@ -658,16 +818,17 @@ def run_competitive_round(round_num):
         timer_text.setText(f"Study Time: {time_left:.1f}s")
         timer_text.draw()
         
-        # Draw score
-        score_text.setText(f"Round {current_round}/{total_rounds} | Team Score: {player_scores['A']}")
+        # Draw score (setText only when the string changes)
+        score_str = f"Round {current_round}/{total_rounds} | Team Score: {player_scores['A']}"
+        if score_str != last_score_str:
+            score_text.setText(score_str)
+            last_score_str = score_str
         score_text.draw()
         
-        win.flip()
-        core.wait(0.016)
+        win.flip()  # waits for vblank, so the loop runs once per refresh
         
         # Check for escape
-        keys = event.getKeys()
-        if 'escape' in keys:
+        if kb.getKeys(['escape'], waitRelease=False):
             return None
     
     el_tracker.sendMessage(f"ROUND_{current_round}_STUDY_END")
@@ -675,7 +836,8 @@ def run_competitive_round(round_num):
     # Recall phase (no time limit - wait for responses)
     game_state = 'recall'
     target_pos = grid_positions[target_position]
-    target_cover.setPos([target_pos[0], target_pos[1]])  # Position the red target cover
+    target_cover.setPos(target_pos)  # Position the red target cover
+    set_uncovered_cell(target_position)  # covers stay off the target through recall and feedback
     
     el_tracker.sendMessage(f"ROUND_{current_round}_RECALL_START")
     
@@ -686,68 +848,53 @@ def run_competitive_round(round_num):
     # No time limit - wait for user response
     while response is None:
         update_local_gaze_display()
+        apply_network_updates()
         update_remote_gaze_display()
         
-        win.clearBuffer()
-        
         # Draw covered grid with red target square
-        for i, cover in enumerate(grid_covers):
-            if i != target_position:
-                cover.draw()
+        draw_covers()
         
         # Draw bright red square for target position
         target_cover.draw()
         
         # Draw gaze markers
         local_gaze_marker.draw()
-        if remote_gaze_data.get('valid', False):
+        if remote_gaze[2]:
             remote_gaze_marker.draw()
         
         # Draw instructions
-        instruction_text = visual.TextStim(win, text='H=House  C=Car  F=Face  L=Limb', 
-                                         pos=[0, -scn_height//2 + 30], color='white', height=16)
         instruction_text.draw()
         
-        # Draw score
-        score_text.setText(f"Round {current_round}/{total_rounds} | Team Score: {player_scores['A']}")
+        # Draw score (setText only when the string changes)
+        score_str = f"Round {current_round}/{total_rounds} | Team Score: {player_scores['A']}"
+        if score_str != last_score_str:
+            score_text.setText(score_str)
+            last_score_str = score_str
         score_text.draw()
         
-        win.flip()
-        core.wait(0.016)
+        win.flip()  # waits for vblank, so the loop runs once per refresh
         
-        # Check for response
-        keys = event.getKeys()
-        if 'h' in keys:
-            response = 'house'
-            response_time = core.getTime() - recall_start
-        elif 'c' in keys:
-            response = 'car'
-            response_time = core.getTime() - recall_start
-        elif 'f' in keys:
-            response = 'face'
+        # Check for response (first recognised key wins)
+        for key in kb.getKeys(RECALL_KEYS, waitRelease=False):
+            if key.name == 'escape':
+                return None
+            response = KEY_TO_CATEGORY[key.name]
             response_time = core.getTime() - recall_start
-        elif 'l' in keys:
-            response = 'limb'
-            response_time = core.getTime() - recall_start
-        elif 'escape' in keys:
-            return None
+            break
     
     # Record our response
     if response:
         game_sync_data['responses']['A'] = {
             'answer': response,
             'time': response_time,
-            'timestamp': time.time()
+            'timestamp': wall_time()
         }
         send_game_data('response', game_sync_data['responses']['A'])
         el_tracker.sendMessage(f"ROUND_{current_round}_RESPONSE_A_{response}_{response_time:.3f}")
     
-    # Wait for both responses or timeout
-    wait_start = time.time()
-    while time.time() - wait_start < 3.0:  # Wait up to 3 seconds for other player
-        if 'B' in game_sync_data['responses']:
-            break
-        time.sleep(0.01)
+    # Wait up to 3 seconds for the other player; the network thread wakes us when B's answer arrives
+    b_response_event.wait(timeout=3.0)
+    apply_network_updates()
     
     # Determine winner and scoring - Collaborative logic
     a_response = game_sync_data['responses'].get('A')
@@ -800,17 +947,28 @@ def run_competitive_round(round_num):
         round_result['points_awarded'] = 0
     
     trial_results.append(round_result)
+    write_result_row(round_result)
     
     # Show feedback (3 seconds)
     game_state = 'feedback'
-    feedback_start = core.getTime()
     
-    while core.getTime() - feedback_start < 3.0:
+    # Feedback message is fixed for the round, so set it up once
+    if round_result['points_awarded'] > 0:
+        feedback_msg = f"{round_result['winner']} - Correct! +1 point for both players"
+        feedback_color = 'green'
+    else:
+        feedback_msg = f"{round_result['winner']} - No points this round"
+        feedback_color = 'red'
+    
+    feedback_text.setText(feedback_msg)
+    feedback_text.color = feedback_color
+    
+    feedback_timer = core.CountdownTimer(FEEDBACK_DURATION)
+    while feedback_timer.getTime() > 0:
         update_local_gaze_display()
+        apply_network_updates()
         update_remote_gaze_display()
         
-        win.clearBuffer()
-        
         # Show correct answer
         if grid_stimuli[target_position]['image_type'] == 'rect':
             grid_stimuli[target_position]['rect'].draw()
@@ -819,69 +977,70 @@ def run_competitive_round(round_num):
             grid_stimuli[target_position]['image'].draw()
         
         # Draw other covers
-        for i, cover in enumerate(grid_covers):
-            if i != target_position:
-                cover.draw()
+        draw_covers()
         
         # Draw gaze markers
         local_gaze_marker.draw()
-        if remote_gaze_data.get('valid', False):
+        if remote_gaze[2]:
             remote_gaze_marker.draw()
         
         # Draw feedback
-        if round_result['points_awarded'] > 0:
-            feedback_msg = f"{round_result['winner']} - Correct! +1 point for both players"
-            feedback_color = 'green'
-        else:
-            feedback_msg = f"{round_result['winner']} - No points this round"
-            feedback_color = 'red'
-        
-        feedback_text = visual.TextStim(win, text=feedback_msg, pos=[0, -scn_height//2 + 60],
-                                      color=feedback_color, height=20, bold=True)
         feedback_text.draw()
         
-        # Draw score
-        score_text.setText(f"Round {current_round}/{total_rounds} | Team Score: {player_scores['A']}")
+        # Draw score (setText only when the string changes)
+        score_str = f"Round {current_round}/{total_rounds} | Team Score: {player_scores['A']}"
+        if score_str != last_score_str:
+            score_text.setText(score_str)
+            last_score_str = score_str
         score_text.draw()
         
-        win.flip()
-        core.wait(0.016)
+        win.flip()  # waits for vblank, so the loop runs once per refresh
         
         # Check for escape
-        keys = event.getKeys()
-        if 'escape' in keys:
+        if kb.getKeys(['escape'], waitRelease=False):
             return None
     
     el_tracker.sendMessage(f"ROUND_{current_round}_END")
     
     # Clear responses for next round
     game_sync_data['responses'] = {}
+    b_response_event.clear()
     
     return round_result
 
+def write_result_row(result):
+    """Append one round to the results file and flush it to disk"""
+    a_resp = result['a_response']['answer'] if result['a_response'] else 'None'
+    a_time = result['a_response']['time'] if result['a_response'] else 'None'
+    b_resp = result['b_response']['answer'] if result['b_response'] else 'None'
+    b_time = result['b_response']['time'] if result['b_response'] else 'None'
+    
+    fields = (result['round'], result['difficulty'], result['target_position'], result['target_category'],
+              a_resp, a_time, b_resp, b_time, result['winner'], result['points_awarded'], result['mode'])
+    results_fh.write('\t'.join(map(str, fields)) + '\n')
+    results_fh.flush()
+    os.fsync(results_fh.fileno())
+
 def clear_screen(win):
-    win.clearBuffer()
-    win.flip()
+    win.flip()  # flip() clears the back buffer, so an empty frame is just one flip
+
+@functools.lru_cache(maxsize=16)
+def _get_msg_stim(text):
+    """Laid-out TextStim for a message, kept so repeated screens reuse it"""
+    return visual.TextStim(win, text, color='white', wrapWidth=scn_width*0.8,
+                           height=24, bold=True)
 
 def show_msg(win, text, wait_for_keypress=True):
-    msg = visual.TextStim(win, text, color='white', wrapWidth=scn_width*0.8, 
-                         height=24, bold=True)
+    msg = _get_msg_stim(text)
     
-    clear_screen(win)
+    msg.draw()
+    win.flip()
     
     if wait_for_keypress:
-        while True:
-            win.clearBuffer()
-            msg.draw()
-            win.flip()
-            core.wait(0.016)
-            
-            keys = event.getKeys()
-            if keys:
-                break
-    else:
-        msg.draw()
-        win.flip()
+        # The message stays on screen, so block on the keyboard instead of redrawing every frame.
+        # Round loops only consume the keys they watch, so drop anything left over first
+        kb.clearEvents()
+        kb.waitKeys(waitRelease=False)
     
     clear_screen(win)
 
@@ -890,20 +1049,9 @@ def terminate_task():
     
     print("\nCleaning up...")
     
-    # Save game results
+    # Game results were written as each round finished
+    results_fh.close()
     if trial_results:
-        results_file = os.path.join(session_folder, f"{session_identifier}_competitive_results.txt")
-        with open(results_file, 'w') as f:
-            f.write("Round\tDifficulty\tPosition\tTarget\tA_Response\tA_Time\tB_Response\tB_Time\tWinner\tPoints\tMode\n")
-            for result in trial_results:
-                a_resp = result['a_response']['answer'] if result['a_response'] else 'None'
-                a_time = result['a_response']['time'] if result['a_response'] else 'None'
-                b_resp = result['b_response']['answer'] if result['b_response'] else 'None'
-                b_time = result['b_response']['time'] if result['b_response'] else 'None'
-                
-                f.write(f"{result['round']}\t{result['difficulty']}\t{result['target_position']}\t{result['target_category']}\t"
-                       f"{a_resp}\t{a_time}\t{b_resp}\t{b_time}\t{result['winner']}\t{result['points_awarded']}\t{result['mode']}\n")
-        
         print(f"✓ Game results saved: Team Score={player_scores['A']} (both players have same score)")
     
     # Close network sockets
@@ -938,49 +1086,56 @@ def terminate_task():
             print(f"Cleanup error: {e}")
     
     # Print final statistics
-    if local_gaze_stats['total_attempts'] > 0:
-        valid_rate = 100 * local_gaze_stats['valid_gaze_data'] / local_gaze_stats['total_attempts']
+    if STATS[S_TOTAL] > 0:
+        valid_rate = 100 * STATS[S_VALID] / STATS[S_TOTAL]
         print(f"\nFinal Statistics:")
-        print(f"  Local gaze valid: {local_gaze_stats['valid_gaze_data']}/{local_gaze_stats['total_attempts']} ({valid_rate:.1f}%)")
-        print(f"  Network sent: {network_stats['sent']}")
-        print(f"  Network received: {network_stats['received']}")
-        print(f"  Network errors: {network_stats['errors']}")
+        print(f"  Local gaze valid: {STATS[S_VALID]}/{STATS[S_TOTAL]} ({valid_rate:.1f}%)")
+        print(f"  Network sent: {STATS[S_SENT]}")
+        print(f"  Network received: {STATS[S_RECV]}")
+        print(f"  Network errors: {STATS[S_ERR]}")
     
     win.close()
     core.quit()
     sys.exit()
 
 # Show instructions
-task_msg = 'Computer A - Simplified Collaborative Memory Game\n\n'
-task_msg += 'Two-Player Collaborative Rules:\n'
-task_msg += '• Study grid for 5 seconds\n'
-task_msg += '• Recall what was at marked position\n'
-task_msg += '• Press H=House, C=Car, F=Face, L=Limb\n'
-task_msg += '• NO TIME LIMIT for responses\n'
-task_msg += '• First player to respond determines team outcome:\n'
-task_msg += '  - If first responder is CORRECT: +1 point for BOTH players\n'
-task_msg += '  - If first responder is WRONG: 0 points for BOTH players\n'
-task_msg += '• Second player response is ignored\n'
-task_msg += '• MEDIUM DIFFICULTY ONLY: 4x4 logical patterns\n'
-task_msg += f'• {total_rounds} rounds total\n\n'
-task_msg += 'Network Configuration:\n'
-task_msg += f'• Local IP: {LOCAL_IP}\n'
-task_msg += f'• Remote IP: {REMOTE_IP}\n\n'
-task_msg += 'Controls:\n'
-task_msg += '• SPACE = Recalibrate eye tracker\n'
-task_msg += '• ESCAPE = Exit program\n\n'
-task_msg += 'SIMPLIFIED VERSION:\n'
-task_msg += '• Single calibration (no validation)\n'
-task_msg += '• Medium difficulty only\n'
-task_msg += '• PNG image support\n'
-task_msg += '• Correct plural folder names (limbs, not limb)\n'
-task_msg += '• TWO PLAYER ONLY\n\n'
-task_msg += 'ROLE: ROUND INITIATOR\n'
-task_msg += '• Computer A starts each round\n'
-task_msg += '• Sends parameters to Computer B\n\n'
-if dummy_mode:
-    task_msg += 'DUMMY MODE: Simulated eye tracking\n'
-task_msg += 'Press any key to begin calibration'
+task_msg = '\n'.join([
+    'Computer A - Simplified Collaborative Memory Game',
+    '',
+    'Two-Player Collaborative Rules:',
+    '• Study grid for 5 seconds',
+    '• Recall what was at marked position',
+    '• Press H=House, C=Car, F=Face, L=Limb',
+    '• NO TIME LIMIT for responses',
+    '• First player to respond determines team outcome:',
+    '  - If first responder is CORRECT: +1 point for BOTH players',
+    '  - If first responder is WRONG: 0 points for BOTH players',
+    '• Second player response is ignored',
+    '• MEDIUM DIFFICULTY ONLY: 4x4 logical patterns',
+    f'• {total_rounds} rounds total',
+    '',
+    'Network Configuration:',
+    f'• Local IP: {LOCAL_IP}',
+    f'• Remote IP: {REMOTE_IP}',
+    '',
+    'Controls:',
+    '• SPACE = Recalibrate eye tracker',
+    '• ESCAPE = Exit program',
+    '',
+    'SIMPLIFIED VERSION:',
+    '• Single calibration (no validation)',
+    '• Medium difficulty only',
+    '• PNG image support',
+    '• Correct plural folder names (limbs, not limb)',
+    '• TWO PLAYER ONLY',
+    '',
+    'ROLE: ROUND INITIATOR',
+    '• Computer A starts each round',
+    '• Sends parameters to Computer B',
+    '',
+] + (['DUMMY MODE: Simulated eye tracking'] if dummy_mode else []) + [
+    'Press any key to begin calibration',
+])
 
 show_msg(win, task_msg)
 
@@ -1000,6 +1155,7 @@ if not dummy_mode:
         win.winHandle.activate()
         win.flip()
         event.clearEvents()
+        kb.clearEvents()
         
     except RuntimeError as err:
         print('Calibration ERROR:', err)
@@ -1016,9 +1172,10 @@ send_game_data('ready', {'computer': 'A'})
 
 # Wait for Computer B to be ready
 print("Waiting for Computer B to be ready...")
-start_time = time.time()
+start_time = now()
 while not game_sync_data.get('b_ready', False):
-    if time.time() - start_time > 30:  # 30 second timeout
+    apply_network_updates()
+    if now() - start_time > 30:  # 30 second timeout
         print("Timeout waiting for Computer B")
         break
     time.sleep(0.1)
@@ -1104,14 +1261,14 @@ try:
         completion_msg += f'Final Team Score: {player_scores["A"]} points\n\n'
         
         completion_msg += f'Local Eye Tracking:\n'
-        local_valid_rate = 100 * local_gaze_stats['valid_gaze_data'] / max(1, local_gaze_stats['total_attempts'])
+        local_valid_rate = 100 * STATS[S_VALID] / max(1, STATS[S_TOTAL])
         completion_msg += f'• Valid gaze data: {local_valid_rate:.1f}%\n'
-        completion_msg += f'• Total samples: {local_gaze_stats["samples_received"]}\n\n'
+        completion_msg += f'• Total samples: {STATS[S_SAMPLES]}\n\n'
         
         completion_msg += f'Network Communication:\n'
-        completion_msg += f'• Data sent to B: {network_stats["sent"]} packets\n'
-        completion_msg += f'• Data received from B: {network_stats["received"]} packets\n'
-        completion_msg += f'• Network errors: {network_stats["errors"]}\n\n'
+        completion_msg += f'• Data sent to B: {STATS[S_SENT]} packets\n'
+        completion_msg += f'• Data received from B: {STATS[S_RECV]} packets\n'
+        completion_msg += f'• Network errors: {STATS[S_ERR]}\n\n'
         
         completion_msg += f'Data saved to EDF file\n\n'
         completion_msg += f'SIMPLIFIED VERSION:\n'
@@ -8,13 +8,13 @@ Receives gaze data from Computer A (100.1.1.10) and sends own gaze data to A
 import pylink
 import os
 import platform
-import random
 import time
 import sys
 import numpy as np
 import socket
 import threading
 import json
+import struct
 from psychopy import visual, core, event, monitors, gui
 from EyeLinkCoreGraphicsPsychoPy import EyeLinkCoreGraphicsPsychoPy
 from PIL import Image
@@ -27,10 +27,13 @@ GAZE_PORT = 8889
 SEND_PORT = 8888
 GAME_PORT = 8891  # New port for game synchronization
 
+# Gaze packet wire format (must match Computer A): x, y, valid, sender
+_PACKER = struct.Struct('<ddBB')
+
 # Global variables
 el_tracker = None
 win = None
-remote_gaze_data = {'x': 0, 'y': 0, 'valid': False, 'timestamp': 0}
+remote_gaze_data = {'x': 0, 'y': 0, 'valid': False, 'rx': 0}
 network_stats = {'sent': 0, 'received': 0, 'errors': 0}
 
 # Game variables
@@ -43,6 +46,14 @@ trial_results = []
 game_sync_data = {'round': 0, 'target_pos': 0, 'grid_seed': 0, 'responses': {}}
 player_scores = {'A': 0, 'B': 0}
 
+# Category mapping (consistent with Computer A)
+CATEGORY_MAP = {
+    0: 'face',
+    1: 'limb', 
+    2: 'house',
+    3: 'car'
+}
+
 # Game sockets
 game_send_socket = None
 game_receive_socket = None
@@ -146,15 +157,7 @@ def send_gaze_data(gaze_x, gaze_y, valid=True):
     global network_stats
     
     try:
-        data = {
-            'x': float(gaze_x),
-            'y': float(gaze_y),
-            'valid': valid,
-            'timestamp': time.time(),
-            'computer': 'B'
-        }
-        
-        message = json.dumps(data).encode('utf-8')
+        message = _PACKER.pack(float(gaze_x), float(gaze_y), int(valid), ord('B'))
         send_socket.sendto(message, (REMOTE_IP, SEND_PORT))
         network_stats['sent'] += 1
         
@@ -184,10 +187,13 @@ def receive_gaze_data():
     while True:
         try:
             data, addr = receive_socket.recvfrom(1024)
-            gaze_info = json.loads(data.decode('utf-8'))
+            x, y, valid, computer = _PACKER.unpack_from(data)
             
-            if gaze_info.get('computer') == 'A':
-                remote_gaze_data.update(gaze_info)
+            if computer == ord('A'):
+                remote_gaze_data['x'] = x
+                remote_gaze_data['y'] = y
+                remote_gaze_data['valid'] = bool(valid)
+                remote_gaze_data['rx'] = time.monotonic()  # local receive time, immune to clock skew
                 network_stats['received'] += 1
                 
         except socket.timeout:
@@ -354,16 +360,17 @@ def create_game_grid():
     grid_covers = []
     grid_positions.clear()
     
-    # Create image categories - 4 of each type for 16 logical positions
-    categories = ['face', 'limb', 'house', 'car']
-    all_items = []
-    for category in categories:
-        for i in range(4):
-            all_items.append(category)
-    
-    # Shuffle the items based on seed received from Computer A
-    random.seed(game_sync_data.get('grid_seed', 42))
-    random.shuffle(all_items)
+    # Rebuild Computer A's layout from the round's condition, in the same row-major cell order:
+    # a 16-element (medium) pattern fills 2x2 blocks, a 64-element (hard) one maps 1:1 onto 8x8.
+    # grid_seed only picks A's image files; B draws categories, so it does not need it.
+    condition = game_sync_data.get('condition')
+    if condition is not None:
+        all_items = [CATEGORY_MAP[num] for num in condition]
+    else:
+        # No round received yet (startup): placeholder layout, 4 of each type
+        all_items = ['face', 'limb', 'house', 'car'] * 4
+    if len(all_items) == physical_grid_size * physical_grid_size:
+        logical_grid_size = physical_grid_size
     
     # Category colors for visualization
     category_colors = {
@@ -382,8 +389,8 @@ def create_game_grid():
             grid_positions.append((x_pos, y_pos))
             
             # Determine which logical cell this physical cell belongs to
-            logical_row = row // 2
-            logical_col = col // 2
+            logical_row = row * logical_grid_size // physical_grid_size
+            logical_col = col * logical_grid_size // physical_grid_size
             logical_idx = logical_row * logical_grid_size + logical_col
             
             # Get the category for this logical position
@@ -484,7 +491,7 @@ def update_remote_gaze_display():
     global remote_gaze_data
     
     if remote_gaze_data.get('valid', False):
-        if time.time() - remote_gaze_data.get('timestamp', 0) < 0.1:
+        if time.monotonic() - remote_gaze_data.get('rx', 0) < 0.1:
             try:
                 gaze_x = (scn_width/2 + 200 - remote_gaze_data['x']) 
                 gaze_y = (remote_gaze_data['y'] - scn_height/2 - 800)
@@ -520,7 +527,7 @@ def run_competitive_round():
     
     target_position = game_sync_data['target_pos']
     
-    # Recreate grid with the same seed as Computer A
+    # Recreate Computer A's grid from the received condition
     create_game_grid()
     target_category = grid_stimuli[target_position]['category']
     target_logical_idx = grid_stimuli[target_position]['logical_idx']
@@ -18,6 +18,7 @@ import numpy as np
 import socket
 import threading
 import json
+import struct
 from psychopy import visual, core, event, monitors, gui
 from EyeLinkCoreGraphicsPsychoPy import EyeLinkCoreGraphicsPsychoPy
 from PIL import Image
@@ -30,6 +31,9 @@ GAZE_PORT = 8889
 SEND_PORT = 8888
 GAME_PORT = 8891  # New port for game synchronization
 
+# Gaze packet wire format, shared with Computer A: timestamp, x, y, valid, sender ('A'/'B')
+GAZE_FMT = struct.Struct('<dff?c')
+
 # Global variables
 el_tracker = None
 win = None
@@ -437,15 +441,7 @@ def send_gaze_data(gaze_x, gaze_y, valid=True):
     global network_stats
     
     try:
-        data = {
-            'x': float(gaze_x),
-            'y': float(gaze_y),
-            'valid': valid,
-            'timestamp': time.time(),
-            'computer': 'B'
-        }
-        
-        message = json.dumps(data).encode('utf-8')
+        message = GAZE_FMT.pack(time.time(), gaze_x, gaze_y, bool(valid), b'B')
         send_socket.sendto(message, (REMOTE_IP, SEND_PORT))
         network_stats['sent'] += 1
         
@@ -475,10 +471,15 @@ def receive_gaze_data():
     while True:
         try:
             data, addr = receive_socket.recvfrom(1024)
-            gaze_info = json.loads(data.decode('utf-8'))
             
-            if gaze_info.get('computer') == 'A':
-                remote_gaze_data.update(gaze_info)
+            if len(data) == GAZE_FMT.size:
+                timestamp, x, y, valid, sender = GAZE_FMT.unpack_from(data)
+                if sender != b'A':  # ignore our own packets looped back
+                    continue
+                remote_gaze_data['x'] = x
+                remote_gaze_data['y'] = y
+                remote_gaze_data['valid'] = valid
+                remote_gaze_data['timestamp'] = timestamp
                 network_stats['received'] += 1
                 
         except socket.timeout: